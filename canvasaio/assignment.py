@@ -11,14 +11,11 @@ from canvasaio.util import combine_kwargs, obj_or_id
 
 
 class Assignment(CanvasObject):
-    def __init__(self, requester, attributes):
-        super(Assignment, self).__init__(requester, attributes)
-
-        if "overrides" in attributes:
-            self.overrides = [
-                AssignmentOverride(requester, override)
-                for override in attributes["overrides"]
-            ]
+    _nested_attributes = {
+        "overrides": lambda requester, overrides: [
+            AssignmentOverride(requester, override) for override in overrides
+        ]
+    }
 
     def __str__(self):
         return "{} ({})".format(self.name, self.id)
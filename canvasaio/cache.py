@@ -0,0 +1,315 @@
+from collections import OrderedDict, namedtuple
+import json
+import re
+import sqlite3
+import time
+
+from multidict import CIMultiDict, CIMultiDictProxy, MultiDict, MultiDictProxy
+from yarl import URL
+
+#: A cached response body, together with the headers it was served with.
+#: ``path`` is the URL path of the resource, used for invalidation.
+CacheEntry = namedtuple("CacheEntry", ["url", "path", "headers", "body"])
+
+# Headers that describe the transfer rather than the resource
+_UNCACHED_HEADERS = frozenset(
+    [
+        "connection",
+        "keep-alive",
+        "transfer-encoding",
+        "content-encoding",
+        "content-length",
+        "set-cookie",
+    ]
+)
+
+
+def entry_from_response(response, body, path):
+    """
+    Build a :class:`CacheEntry` from a response, if it carries a validator
+    and does not forbid storing it.
+
+    :param response: The response to store.
+    :type response: :class:`aiohttp.ClientResponse`
+    :param body: The body of the response.
+    :type body: bytes
+    :param path: The URL path of the requested resource.
+    :type path: str
+    :returns: The entry, or None if the response has neither an ``ETag``
+        nor a ``Last-Modified`` header, or is marked ``Cache-Control: no-store``.
+    :rtype: :class:`CacheEntry`
+    """
+    if "ETag" not in response.headers and "Last-Modified" not in response.headers:
+        return None
+    directives = response.headers.get("Cache-Control", "").split(",")
+    if "no-store" in (directive.strip().lower() for directive in directives):
+        return None
+    headers = [
+        (key, value)
+        for key, value in response.headers.items()
+        if key.lower() not in _UNCACHED_HEADERS
+    ]
+    return CacheEntry(str(response.url), path, headers, body)
+
+
+def validator_headers(entry):
+    """
+    Build the conditional request headers for revalidating an entry.
+
+    :param entry: The cached entry.
+    :type entry: :class:`CacheEntry`
+    :rtype: dict
+    """
+    headers = CIMultiDict(entry.headers)
+    validators = {}
+    if "ETag" in headers:
+        validators["If-None-Match"] = headers["ETag"]
+    if "Last-Modified" in headers:
+        validators["If-Modified-Since"] = headers["Last-Modified"]
+    return validators
+
+
+def entry_size(entry):
+    """
+    Approximate number of bytes held by an entry.
+
+    :param entry: The cached entry.
+    :type entry: :class:`CacheEntry`
+    :rtype: int
+    """
+    return len(entry.body) + sum(len(key) + len(value) for key, value in entry.headers)
+
+
+class CachedResponse(object):
+    """
+    Stand-in for :class:`aiohttp.ClientResponse`, returned by
+    :func:`canvasaio.requester.Requester.request` when Canvas answers a
+    conditional request with "304 Not Modified".
+
+    It supports the subset of the response interface used throughout canvasaio:
+    ``status``, ``headers``, ``links``, ``url``, ``content_length``, and the
+    ``read()``, ``text()`` and ``json()`` coroutines.
+    """
+
+    status = 200
+    reason = "OK"
+    from_cache = True
+
+    def __init__(self, entry):
+        """
+        :param entry: The cached entry to serve.
+        :type entry: :class:`CacheEntry`
+        """
+        self.url = URL(entry.url)
+        self.headers = CIMultiDictProxy(CIMultiDict(entry.headers))
+        self._body = entry.body
+
+    def __repr__(self):
+        return "<CachedResponse({}) [200 OK]>".format(self.url)
+
+    def close(self):
+        pass
+
+    @property
+    def content_length(self):
+        return len(self._body)
+
+    @property
+    def content_type(self):
+        return self.headers.get("Content-Type", "application/octet-stream").split(";")[
+            0
+        ]
+
+    async def json(self, content_type=None, **kwargs):
+        if not self._body.strip():
+            return None
+        return json.loads(self._body)
+
+    @property
+    def links(self):
+        links = MultiDict()
+        for value in re.split(r",(?=\s*<)", ", ".join(self.headers.getall("Link", []))):
+            match = re.match(r"\s*<(.*)>(.*)", value)
+            if match is None:
+                continue
+            url, params = match.groups()
+            link = MultiDict()
+            for param in params.split(";")[1:]:
+                match = re.match(r"^\s*(\S*)\s*=\s*(['\"]?)(.*?)(\2)\s*$", param)
+                if match is not None:
+                    link.add(match.group(1), match.group(3))
+            key = link.get("rel", url)
+            link.add("url", self.url.join(URL(url)))
+            links.add(key, MultiDictProxy(link))
+        return MultiDictProxy(links)
+
+    async def read(self):
+        return self._body
+
+    def release(self):
+        pass
+
+    async def text(self, encoding="utf-8"):
+        return self._body.decode(encoding)
+
+
+class BaseCache(object):
+    """
+    Interface for storing validated GET responses.
+
+    Entries are looked up by an opaque string key and can be dropped in bulk by
+    URL path, which is how writes to a resource invalidate cached reads.
+    """
+
+    async def clear(self):
+        """
+        Drop all entries.
+        """
+        raise NotImplementedError
+
+    async def get(self, key):
+        """
+        Look up an entry.
+
+        :param key: The cache key.
+        :type key: str
+        :rtype: :class:`CacheEntry` or None
+        """
+        raise NotImplementedError
+
+    async def invalidate(self, path):
+        """
+        Drop all entries for the given URL path, whatever their query string.
+
+        :param path: The URL path of the resource.
+        :type path: str
+        """
+        raise NotImplementedError
+
+    async def set(self, key, entry):
+        """
+        Store an entry, replacing any previous entry with the same key.
+
+        :param key: The cache key.
+        :type key: str
+        :param entry: The entry to store.
+        :type entry: :class:`CacheEntry`
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """
+    In-memory cache that evicts the least recently used entries once the total
+    size of the stored bodies and headers exceeds a byte budget.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        :param max_bytes: The byte budget of the cache.
+        :type max_bytes: int
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry_size(entry)
+
+    async def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def invalidate(self, path):
+        for key in [key for key, entry in self._entries.items() if entry.path == path]:
+            self._discard(key)
+
+    async def set(self, key, entry):
+        self._discard(key)
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += size
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+
+class SQLiteCache(BaseCache):
+    """
+    On-disk cache backed by an SQLite database, which survives restarts and can
+    be shared by several processes.
+
+    Operations run synchronously on the event loop thread; they are short
+    single-row statements, but place the database on local storage.
+    """
+
+    def __init__(self, filename):
+        """
+        :param filename: Path of the database file (created if missing).
+        :type filename: str
+        """
+        self.filename = filename
+        self._db = sqlite3.connect(filename)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, url TEXT, path TEXT, headers TEXT, "
+                "body BLOB, stored_at REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_path ON entries (path)"
+            )
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    async def clear(self):
+        with self._db:
+            self._db.execute("DELETE FROM entries")
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self._db.close()
+
+    async def get(self, key):
+        row = self._db.execute(
+            "SELECT url, path, headers, body FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        url, path, headers, body = row
+        return CacheEntry(
+            url, path, [tuple(h) for h in json.loads(headers)], bytes(body)
+        )
+
+    async def invalidate(self, path):
+        with self._db:
+            self._db.execute("DELETE FROM entries WHERE path = ?", (path,))
+
+    async def set(self, key, entry):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.path,
+                    json.dumps(entry.headers),
+                    entry.body,
+                    time.time(),
+                ),
+            )
@@ -28,12 +28,16 @@ class Canvas(object):
     The main class to be instantiated to provide access to Canvas's API.
     """
 
-    def __init__(self, base_url, access_token):
+    def __init__(self, base_url, access_token, **kwargs):
         """
         :param base_url: The base URL of the Canvas instance's API.
         :type base_url: str
         :param access_token: The API key to authenticate requests with.
         :type access_token: str
+        :param kwargs: Optional settings forwarded to
+            :class:`canvasaio.requester.Requester`, such as ``rate_limiter``,
+            ``retry_policy``, ``cache``, ``coalesce`` or the connection pool
+            settings. See the requester for the complete list.
         """
         if "api/v1" in base_url:
             raise ValueError(
@@ -65,7 +69,7 @@ class Canvas(object):
         access_token = access_token.strip()
         base_url = get_institution_url(base_url)
 
-        self.__requester = Requester(base_url, access_token)
+        self.__requester = Requester(base_url, access_token, **kwargs)
 
     async def close(self):
         await self.__requester.close()
@@ -11,8 +11,59 @@ class CanvasObject(object):
 
     This makes a call to :func:`canvasaio.canvas_object.CanvasObject.set_attributes`
     to dynamically construct this object's attributes with a JSON object.
+
+    If the requester was created with ``lazy_objects=True``, the object instead
+    keeps a reference to the JSON object and resolves attributes (including
+    nested objects) the first time they are accessed. Attributes assigned
+    directly or through :func:`set_attributes` take precedence.
     """
 
+    #: Attributes that hold nested objects, mapped to the function building
+    #: them from the requester and the JSON value.
+    _nested_attributes = {}
+
+    #: Whether instances may be shared through the identity map of the
+    #: requester. Disabled for types whose ids are only unique within their
+    #: parent object.
+    _interned = True
+
+    def __delattr__(self, name):
+        attributes = self.__dict__.get("_attributes")
+        if attributes is not None and name in attributes:
+            # Copy rather than modify the JSON object, which may be shared
+            self._attributes = {
+                key: value for key, value in attributes.items() if key != name
+            }
+            self.__dict__.pop(name, None)
+        else:
+            super(CanvasObject, self).__delattr__(name)
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, i.e. for attributes of lazy
+        # objects and `*_date` attributes that have not been resolved yet
+        attributes = self.__dict__.get("_attributes")
+        if attributes is not None and name in attributes:
+            value = attributes[name]
+            build = self._nested_attributes.get(name)
+            if build is None:
+                return value
+            nested = build(self._requester, value)
+            self.__dict__[name] = nested
+            return nested
+        if name.endswith("_date"):
+            base = name[:-5]
+            if base in self.__dict__ or attributes is None:
+                value = self.__dict__.get(base)
+            else:
+                value = attributes.get(base)
+            if isinstance(value, str) and DATE_PATTERN.match(value):
+                aware = parse_date(value)
+                self.__dict__[name] = aware
+                return aware
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(self.__class__.__name__, name)
+        )
+
     def __getattribute__(self, name):
         return super(CanvasObject, self).__getattribute__(name)
 
@@ -24,19 +75,68 @@ class CanvasObject(object):
         :type attributes: dict
         """
         self._requester = requester
-        self.set_attributes(attributes)
+        if getattr(requester, "lazy_objects", False):
+            previous = self.__dict__.get("_attributes")
+            if previous is not None:
+                # A shared instance (see `identity_map`) receiving newer data
+                for name in attributes:
+                    self.__dict__.pop(name, None)
+                    self._discard_date(name)
+                previous = dict(previous)
+                previous.update(attributes)
+                attributes = previous
+            # Attributes are resolved from the JSON object on access
+            self._attributes = attributes
+        else:
+            self.set_attributes(attributes)
+            for name, build in self._nested_attributes.items():
+                if name in attributes:
+                    self.__setattr__(name, build(requester, attributes[name]))
+
+    def __new__(cls, *args, **kwargs):
+        requester = args[0] if args else kwargs.get("requester")
+
+        key = None
+        identity_map = getattr(requester, "identity_map", None)
+        if identity_map is not None and cls._interned:
+            attributes = args[1] if len(args) > 1 else kwargs.get("attributes")
+            if isinstance(attributes, dict) and attributes.get("id") is not None:
+                key = (cls, attributes["id"])
+                instance = identity_map.get(key)
+                if instance is not None:
+                    # __init__ then updates it with the new attributes
+                    return instance
+
+        # Only the class the variant was made for, not its subclasses
+        compact = cls.__dict__.get("_compact_class")
+        if compact is not None and getattr(requester, "compact_objects", False):
+            instance = super(CanvasObject, cls).__new__(compact)
+        else:
+            instance = super(CanvasObject, cls).__new__(cls)
+        if key is not None:
+            identity_map[key] = instance
+        return instance
 
     def __repr__(self):  # pragma: no cover
         classname = self.__class__.__name__
+        values = dict(self.__dict__.get("_attributes") or {})
+        values.update(self.__dict__)
         attrs = ", ".join(
             [
                 "{}={}".format(attr, val)
-                for attr, val in self.__dict__.items()
-                if attr != "attributes"
+                for attr, val in values.items()
+                if attr not in ("attributes", "_attributes")
             ]
         )  # noqa
         return "{}({})".format(classname, attrs)
 
+    def _discard_date(self, attribute):
+        """
+        Drop the datetime parsed from a previous value of an attribute, if any.
+        """
+        if isinstance(self.__dict__.get(attribute + "_date"), datetime):
+            del self.__dict__[attribute + "_date"]
+
     def set_attributes(self, attributes):
         """
         Load this object with attributes.
@@ -55,17 +155,140 @@ class CanvasObject(object):
             }
 
         The `start_at` and `end_at` fields match a date in ISO8601 format,
-        so two additional datetime attributes are created, `start_at_date`
-        and `end_at_date`.
+        so two additional datetime attributes are available, `start_at_date`
+        and `end_at_date`. They are parsed on first access and then cached,
+        so until then they do not appear in the object's ``__dict__``, nor in
+        :func:`vars` or :func:`dir`.
 
         :param attributes: The JSON object to build this object with.
         :type attributes: dict
         """
         for attribute, value in attributes.items():
             self.__setattr__(attribute, value)
+            self._discard_date(attribute)
+
+
+class _CompactObject(object):
+    """
+    Behaviour shared by the slotted classes built by :func:`compact_class`.
+    Fields of the schema live in slots, and any other attribute in a side
+    dictionary that is only created when needed.
+    """
+
+    __slots__ = ()
+
+    def __delattr__(self, name):
+        if name in self._slot_names:
+            object.__delattr__(self, name)
+        elif self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            raise AttributeError(name)
 
-            # datetime field
-            if DATE_PATTERN.match(str(value)):
-                naive = datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
-                aware = naive.replace(tzinfo=pytz.utc)
-                self.__setattr__(attribute + "_date", aware)
+    def __getattr__(self, name):
+        if name in self._slot_names:
+            # An unset slot
+            if name in ("_extra", "_requester"):
+                raise AttributeError(name)
+        elif self._extra is not None and name in self._extra:
+            return self._extra[name]
+        if name.endswith("_date"):
+            value = getattr(self, name[:-5], None)
+            if isinstance(value, str) and DATE_PATTERN.match(value):
+                aware = parse_date(value)
+                self.__setattr__(name, aware)
+                return aware
+        raise AttributeError(
+            "'{}' object has no attribute '{}'".format(self.__class__.__name__, name)
+        )
+
+    def __init__(self, requester, attributes):
+        self._requester = requester
+        if not hasattr(self, "_extra"):
+            # Unless a shared instance (see `identity_map`) is being updated
+            self._extra = None
+        self.set_attributes(attributes)
+        for name, build in self._nested_attributes.items():
+            if name in attributes:
+                self.__setattr__(name, build(requester, attributes[name]))
+
+    def __repr__(self):  # pragma: no cover
+        values = {}
+        for name in self._slot_names:
+            try:
+                values[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        values.update(self._extra or {})
+        attrs = ", ".join("{}={}".format(attr, val) for attr, val in values.items())
+        return "{}({})".format(self.__class__.__name__, attrs)
+
+    def __setattr__(self, name, value):
+        if name in self._slot_names:
+            object.__setattr__(self, name, value)
+        else:
+            if self._extra is None:
+                object.__setattr__(self, "_extra", {})
+            self._extra[name] = value
+
+    def _discard_date(self, attribute):
+        if self._extra is not None and isinstance(
+            self._extra.get(attribute + "_date"), datetime
+        ):
+            del self._extra[attribute + "_date"]
+
+
+def compact_class(cls, fields):
+    """
+    Build a variant of a :class:`CanvasObject` subclass that stores the given
+    fields in ``__slots__`` rather than in a per-instance ``__dict__``, which
+    takes far less memory for objects with many fields. Attributes outside
+    the schema are kept in a side dictionary. Instances of the variant are
+    also instances of `cls`, and are created in its place when the requester
+    was created with ``compact_objects=True``.
+
+    :param cls: The class to build a variant of. It must not define its own
+        ``__init__``.
+    :type cls: type
+    :param fields: The names of the fields usually returned by Canvas.
+    :type fields: iterable of str
+    :rtype: type
+    """
+    fields = tuple(fields)
+    if "__init__" in vars(cls):
+        raise TypeError("{} defines its own __init__".format(cls.__name__))
+    shadowed = [field for field in fields if hasattr(cls, field)]
+    if shadowed:
+        raise ValueError(
+            "Fields would shadow attributes of {}: {}".format(
+                cls.__name__, ", ".join(shadowed)
+            )
+        )
+
+    slots = fields + ("_extra", "_requester")
+    compact = type(
+        "Compact" + cls.__name__,
+        (_CompactObject, cls),
+        {
+            "__slots__": slots,
+            "__module__": cls.__module__,
+            "__doc__": "Slotted variant of :class:`{}.{}`.".format(
+                cls.__module__, cls.__name__
+            ),
+            "_slot_names": frozenset(slots),
+        },
+    )
+    cls._compact_class = compact
+    return compact
+
+
+def parse_date(value):
+    """
+    Parse a date in the ISO8601 format used by Canvas
+    (``YYYY-MM-DDTHH:MM:SSZ``).
+
+    :param value: The date string.
+    :type value: str
+    :rtype: :class:`datetime.datetime`
+    """
+    return datetime.fromisoformat(value[:19]).replace(tzinfo=pytz.utc)
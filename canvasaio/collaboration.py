@@ -27,5 +27,8 @@ class Collaboration(CanvasObject):
 
 
 class Collaborator(CanvasObject):
+    # Collaborator ids are those of the user or group collaborating
+    _interned = False
+
     def __str__(self):
         return "{} ({})".format(self.name, self.id)
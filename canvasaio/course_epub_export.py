@@ -2,6 +2,9 @@ from canvasaio.canvas_object import CanvasObject
 
 
 class CourseEpubExport(CanvasObject):
+    # The id is that of the course, shared by all of its exports
+    _interned = False
+
     def __str__(self):
         return "{} course_id:({}) epub_id:({}) {} ".format(
             self.name,
@@ -1,4 +1,4 @@
-from canvasaio.canvas_object import CanvasObject
+from canvasaio.canvas_object import CanvasObject, compact_class
 
 
 class Enrollment(CanvasObject):
@@ -49,3 +49,56 @@ class Enrollment(CanvasObject):
             "courses/{}/enrollments/{}/reactivate".format(self.course_id, self.id),
         )
         return Enrollment(self._requester, await response.json())
+
+
+#: Slotted variant of :class:`Enrollment`, used instead of it when the
+#: requester was created with ``compact_objects=True``.
+CompactEnrollment = compact_class(
+    Enrollment,
+    (
+        "associated_user_id",
+        "course_id",
+        "course_integration_id",
+        "course_section_id",
+        "created_at",
+        "current_grading_period_id",
+        "current_grading_period_title",
+        "current_period_override_grade",
+        "current_period_override_score",
+        "current_period_unposted_current_grade",
+        "current_period_unposted_current_score",
+        "current_period_unposted_final_grade",
+        "current_period_unposted_final_score",
+        "end_at",
+        "enrollment_state",
+        "grades",
+        "has_grading_periods",
+        "html_url",
+        "id",
+        "last_activity_at",
+        "last_attended_at",
+        "limit_privileges_to_course_section",
+        "override_grade",
+        "override_score",
+        "role",
+        "role_id",
+        "root_account_id",
+        "section_integration_id",
+        "sis_account_id",
+        "sis_course_id",
+        "sis_import_id",
+        "sis_section_id",
+        "sis_user_id",
+        "start_at",
+        "total_activity_time",
+        "totals_for_all_grading_periods_option",
+        "type",
+        "unposted_current_grade",
+        "unposted_current_score",
+        "unposted_final_grade",
+        "unposted_final_score",
+        "updated_at",
+        "user",
+        "user_id",
+    ),
+)
@@ -65,3 +65,14 @@ class UnprocessableEntity(CanvasException):
     """Canvas was unable to process the entity."""
 
     pass
+
+
+class ProgressFailed(CanvasException):
+    """An asynchronous job tracked by a :class:`canvasaio.progress.Progress` failed."""
+
+    def __init__(self, progress):
+        super(ProgressFailed, self).__init__(
+            getattr(progress, "message", None) or "Job {} failed.".format(progress.id)
+        )
+        #: The :class:`canvasaio.progress.Progress` of the failed job.
+        self.progress = progress
@@ -1,11 +1,154 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import re
+import uuid
+
 from canvasaio.canvas_object import CanvasObject
+from canvasaio.exceptions import CanvasException
 from canvasaio.util import combine_kwargs
 
+#: Default number of bytes read at a time when downloading a file.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+#: Default number of bytes fetched by each request of a ranged download.
+DOWNLOAD_RANGE_SIZE = 8 * 1024 * 1024
+
 
 class File(CanvasObject):
     def __str__(self):
         return "{}".format(self.display_name)
 
+    async def _download_ranges(
+        self, location, chunk_size, digest, concurrency, range_size
+    ):
+        part_name = "{}.part".format(location)
+        state_name = "{}.json".format(part_name)
+
+        # The first range doubles as a probe for Range support and the size,
+        # unless resuming, where it may be done already: then a single byte is
+        # enough to tell whether the file changed since
+        previous = _load_range_state(state_name)
+        first = await self._fetch_range(0, range_size - 1 if previous is None else 0)
+        size = _content_range_total(first)
+        if first.status != 206 or size is None:
+            # Not supported: this is the whole body, so stream it as usual
+            try:
+                with open(part_name, "wb") as file_out:
+                    async for chunk in first.content.iter_chunked(chunk_size):
+                        if digest is not None:
+                            digest.update(chunk)
+                        file_out.write(chunk)
+            finally:
+                first.release()
+            os.replace(part_name, location)
+            try:
+                os.unlink(state_name)
+            except FileNotFoundError:
+                pass
+            return
+
+        state = {
+            "size": size,
+            "range_size": range_size,
+            "etag": first.headers.get("ETag"),
+            "done": [],
+        }
+        if (
+            previous is not None
+            and all(previous.get(key) == state[key] for key in state if key != "done")
+            and os.path.isfile(part_name)
+            and os.path.getsize(part_name) == size
+        ):
+            state["done"] = previous["done"]
+        else:
+            with open(part_name, "wb") as file_out:
+                file_out.truncate(size)
+
+        done = set(state["done"])
+        pending = iter(
+            index for index in range(-(-size // range_size)) if index not in done
+        )
+
+        with open(part_name, "r+b", buffering=0) as file_out:
+
+            async def fetch(index, response=None):
+                start = index * range_size
+                end = min(start + range_size, size) - 1
+                if response is None:
+                    response = await self._fetch_range(start, end)
+                try:
+                    if response.status != 206:
+                        raise CanvasException(
+                            "Encountered an error: range request answered with "
+                            "status code {}".format(response.status)
+                        )
+                    offset = start
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        _write_at(file_out, chunk, offset)
+                        offset += len(chunk)
+                finally:
+                    response.release()
+                if offset != end + 1:
+                    raise CanvasException(
+                        "Incomplete range: expected bytes {}-{}, got {}".format(
+                            start, end, offset - start
+                        )
+                    )
+                done.add(index)
+                state["done"] = sorted(done)
+                _save_range_state(state_name, state)
+
+            async def worker(response=None):
+                if response is not None:
+                    await fetch(0, response)
+                for index in pending:
+                    await fetch(index)
+
+            if previous is not None:
+                first.release()
+                tasks = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+            else:
+                # Claim the first range before the workers start pulling
+                next(pending)
+                tasks = [asyncio.ensure_future(worker(first))]
+                tasks += [
+                    asyncio.ensure_future(worker()) for _ in range(concurrency - 1)
+                ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            if digest is not None:
+                # Hashing a large file takes a while: keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, _hash_file, file_out, digest, chunk_size
+                )
+
+        os.replace(part_name, location)
+        os.unlink(state_name)
+
+    async def _fetch_range(self, start, end):
+        return await self._requester.request(
+            "GET",
+            _url=self.url,
+            headers={"Range": "bytes={}-{}".format(start, end)},
+        )
+
+    async def _write_chunks(self, file_out, chunk_size, digest):
+        async for chunk in self.stream(chunk_size):
+            if digest is not None:
+                digest.update(chunk)
+            result = file_out.write(chunk)
+            if inspect.isawaitable(result):
+                await result
+
     async def delete(self, **kwargs):
         """
         Delete this file.
@@ -20,17 +163,73 @@ class File(CanvasObject):
         )
         return File(self._requester, await response.json())
 
-    async def download(self, location):
+    async def download(
+        self,
+        location,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        checksum=None,
+        atomic=True,
+        concurrency=1,
+        range_size=DOWNLOAD_RANGE_SIZE,
+    ):
         """
         Download the file to specified location.
 
-        :param location: The path to download to.
-        :type location: str
+        The body is streamed in chunks of ``chunk_size`` bytes, so memory use
+        does not depend on the size of the file.
+
+        With a ``concurrency`` above 1, a download to a path is split into
+        ranges of ``range_size`` bytes that are fetched in parallel and
+        written in place into ``<location>.part``, preallocated to the size of
+        the file. Completed ranges are recorded in ``<location>.part.json``,
+        so calling this method again after an interruption only fetches the
+        missing ones. If the storage server does not support ``Range``
+        requests, the file is downloaded in one piece instead.
+
+        :param location: The path to download to, or an object with a ``write``
+            method (a regular file object, or a writer whose ``write`` is a
+            coroutine function). Objects are written to but not closed.
+        :type location: str, path-like, or file-like object
+        :param chunk_size: The number of bytes to read at a time.
+        :type chunk_size: int
+        :param checksum: The name of a :mod:`hashlib` algorithm, such as
+            ``"md5"`` or ``"sha256"``, to compute over the downloaded bytes.
+        :type checksum: str
+        :param atomic: When downloading to a path, write to a temporary file in
+            the same directory and rename it into place once complete, so that
+            an interrupted download never leaves a truncated file behind.
+            Ranged downloads always go through ``<location>.part``.
+        :type atomic: bool
+        :param concurrency: The number of ranges to fetch at once.
+        :type concurrency: int
+        :param range_size: The number of bytes per range.
+        :type range_size: int
+        :returns: The hexadecimal digest of the file if ``checksum`` was
+            given, None otherwise.
+        :rtype: str
         """
-        response = await self._requester.request("GET", _url=self.url)
+        digest = hashlib.new(checksum) if checksum else None
+
+        if hasattr(location, "write"):
+            await self._write_chunks(location, chunk_size, digest)
+        elif concurrency > 1:
+            await self._download_ranges(
+                os.fspath(location), chunk_size, digest, concurrency, range_size
+            )
+        elif not atomic:
+            with open(location, "wb") as file_out:
+                await self._write_chunks(file_out, chunk_size, digest)
+        else:
+            temporary, file_out = _create_temporary(os.path.abspath(location))
+            try:
+                with file_out:
+                    await self._write_chunks(file_out, chunk_size, digest)
+                os.replace(temporary, location)
+            except BaseException:
+                os.unlink(temporary)
+                raise
 
-        with open(location, "wb") as file_out:
-            file_out.write(await response.read())
+        return digest.hexdigest() if digest else None
 
     async def get_contents(self):
         """
@@ -40,3 +239,75 @@ class File(CanvasObject):
         """
         response = await self._requester.request("GET", _url=self.url)
         return await response.text()
+
+    async def stream(self, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Iterate over the contents of this file, without holding more than one
+        chunk in memory.
+
+        :param chunk_size: The maximum number of bytes per chunk.
+        :type chunk_size: int
+        :rtype: async iterator of bytes
+        """
+        response = await self._requester.request("GET", _url=self.url)
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+        finally:
+            response.release()
+
+
+def _content_range_total(response):
+    match = re.match(r"bytes \d+-\d+/(\d+)$", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _create_temporary(location):
+    # Unlike tempfile, which makes files readable by their owner only, the
+    # file is created with the permissions open() would give it
+    directory, name = os.path.split(location)
+    while True:
+        temporary = os.path.join(
+            directory, ".{}.{}.part".format(name, uuid.uuid4().hex[:8])
+        )
+        try:
+            fd = os.open(
+                temporary,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                0o666,
+            )
+        except FileExistsError:
+            continue
+        return temporary, os.fdopen(fd, "wb")
+
+
+def _hash_file(file_in, digest, chunk_size):
+    file_in.seek(0)
+    for chunk in iter(lambda: file_in.read(chunk_size), b""):
+        digest.update(chunk)
+
+
+def _load_range_state(name):
+    try:
+        with open(name) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_range_state(name, state):
+    # Written aside and renamed, so that a crash never leaves it truncated
+    with open("{}.tmp".format(name), "w") as state_file:
+        json.dump(state, state_file)
+    os.replace("{}.tmp".format(name), name)
+
+
+def _write_at(file_out, data, offset):
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(file_out.fileno(), view, offset)
+            view, offset = view[written:], offset + written
+    else:
+        file_out.seek(offset)
+        file_out.write(data)
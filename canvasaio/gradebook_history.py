@@ -7,6 +7,9 @@ class Day(CanvasObject):
 
 
 class Grader(CanvasObject):
+    # Grader ids are user ids, repeated for every day they graded on
+    _interned = False
+
     def __str__(self):
         return "{}".format(self.id)
 
@@ -17,5 +20,8 @@ class SubmissionHistory(CanvasObject):
 
 
 class SubmissionVersion(CanvasObject):
+    # Every version carries the id of the submission it belongs to
+    _interned = False
+
     def __str__(self):
         return "{} {}".format(self.assignment_id, self.id)
@@ -0,0 +1,283 @@
+import asyncio
+from collections import Counter, namedtuple
+import json
+import logging
+import os
+
+from canvasaio.paginated_list import merge
+
+logger = logging.getLogger(__name__)
+
+#: Name of the manifest kept at the root of a mirror.
+MANIFEST_NAME = ".canvas-manifest.json"
+
+#: Outcome of :func:`FileMirror.run`. ``downloaded``, ``moved``,
+#: ``unchanged`` and ``removed`` are lists of paths relative to the mirror's
+#: directory; ``failed`` is a list of ``(path, exception)`` pairs, where the
+#: path is that of a file which could not be downloaded or of a folder which
+#: could not be listed.
+MirrorResult = namedtuple(
+    "MirrorResult", ["downloaded", "moved", "unchanged", "removed", "failed"]
+)
+
+# File attributes compared against the manifest to detect changes
+_TRACKED_ATTRIBUTES = ("updated_at", "size", "uuid")
+
+
+class FileMirror(object):
+    """
+    Keep a local directory in sync with the files of a course, group or user.
+
+    The folder tree is listed concurrently, and each file is compared against
+    a manifest stored in the directory, which records the ``updated_at``,
+    ``size`` and ``uuid`` of every file at the time it was mirrored. Only new
+    and changed files are downloaded; files that were merely moved or renamed
+    in Canvas are moved locally. Files that disappeared from Canvas are
+    deleted, or only reported and flagged in the manifest.
+
+    Files in folders that could not be listed are left alone, so a transient
+    error never causes files to be deleted.
+    """
+
+    def __init__(
+        self,
+        context,
+        directory,
+        concurrency=4,
+        folder_concurrency=4,
+        delete=False,
+        manifest_name=MANIFEST_NAME,
+        download_kwargs=None,
+    ):
+        """
+        :param context: The course, group or user whose files to mirror.
+        :type context: :class:`canvasaio.course.Course`,
+            :class:`canvasaio.group.Group` or :class:`canvasaio.user.User`
+        :param directory: The local directory to mirror into.
+        :type directory: str
+        :param concurrency: Maximum number of files downloaded at once.
+        :type concurrency: int
+        :param folder_concurrency: Maximum number of folders listed at once.
+        :type folder_concurrency: int
+        :param delete: Whether to delete the local copies of files removed
+            from Canvas, rather than only flagging them in the manifest.
+        :type delete: bool
+        :param manifest_name: File name of the manifest within `directory`.
+        :type manifest_name: str
+        :param download_kwargs: Extra arguments for
+            :func:`canvasaio.file.File.download`, such as ``concurrency`` for
+            ranged downloads of large files.
+        :type download_kwargs: dict
+        """
+        if concurrency < 1 or folder_concurrency < 1:
+            raise ValueError("`concurrency` and `folder_concurrency` must be positive")
+
+        self.context = context
+        self.directory = directory
+        self.concurrency = concurrency
+        self.folder_concurrency = folder_concurrency
+        self.delete = delete
+        self.manifest_name = manifest_name
+        self.download_kwargs = download_kwargs or {}
+
+    def __repr__(self):
+        return "FileMirror({!r}, {!r})".format(self.context, self.directory)
+
+    async def _download_file(self, file, path, folder, result):
+        target = self._local_path(path)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            await file.download(target, **self.download_kwargs)
+        except Exception as error:
+            result.failed.append((path, error))
+            return None
+        result.downloaded.append(path)
+        return _entry(file, path, folder)
+
+    def _local_path(self, path):
+        return os.path.join(self.directory, *path.split("/"))
+
+    def _move_files(self, listed, previous_files, files, result):
+        """
+        Record the unchanged files among `listed` and carry out the moves, and
+        return the files that are left to download.
+
+        All moves are planned before any of them is made, and go through
+        temporary names, so that files swapping paths in Canvas do not
+        overwrite each other. A file whose previous path is also claimed by
+        another file is downloaded again rather than moved.
+        """
+        unchanged = []
+        moves = []
+        downloads = []
+        for item in listed:
+            file, path, folder = item
+            entry = _entry(file, path, folder)
+            previous = previous_files.get(str(file.id))
+            same = previous is not None and all(
+                previous.get(name) == entry[name] for name in _TRACKED_ATTRIBUTES
+            )
+            if (
+                same
+                and previous["path"] == path
+                and os.path.isfile(self._local_path(path))
+            ):
+                unchanged.append((str(file.id), entry))
+            elif same and os.path.isfile(self._local_path(previous["path"])):
+                moves.append((previous["path"], entry, item))
+            else:
+                downloads.append(item)
+
+        for key, entry in unchanged:
+            files[key] = entry
+            result.unchanged.append(entry["path"])
+
+        claimed = Counter(source for source, entry, item in moves)
+        claimed.update(entry["path"] for key, entry in unchanged)
+        staged = []
+        for source, entry, item in moves:
+            if claimed[source] > 1:
+                downloads.append(item)
+                continue
+            key = str(item[0].id)
+            temporary = "{}.{}.moving".format(self._local_path(source), key)
+            try:
+                os.replace(self._local_path(source), temporary)
+            except OSError as error:
+                result.failed.append((entry["path"], error))
+                continue
+            staged.append((key, temporary, entry))
+
+        for key, temporary, entry in staged:
+            target = self._local_path(entry["path"])
+            try:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temporary, target)
+            except OSError as error:
+                result.failed.append((entry["path"], error))
+                continue
+            files[key] = entry
+            result.moved.append(entry["path"])
+
+        return downloads
+
+    def _read_manifest(self):
+        name = os.path.join(self.directory, self.manifest_name)
+        try:
+            with open(name) as manifest:
+                files = json.load(manifest)["files"]
+            if not isinstance(files, dict):
+                raise ValueError("`files` is not an object")
+            return files
+        except FileNotFoundError:
+            return {}
+        except (KeyError, TypeError, ValueError) as error:
+            # Start over rather than failing every run from now on
+            logger.warning("Ignoring unreadable manifest %s: %s", name, error)
+            return {}
+
+    def _write_manifest(self, files):
+        name = os.path.join(self.directory, self.manifest_name)
+        # Written aside and renamed, so that a crash never leaves it truncated
+        with open("{}.tmp".format(name), "w") as manifest:
+            json.dump(
+                {"version": 1, "files": files}, manifest, indent=1, sort_keys=True
+            )
+        os.replace("{}.tmp".format(name), name)
+
+    async def run(self):
+        """
+        Bring the directory up to date.
+
+        The manifest is written once the run is over, including when it is
+        interrupted, so files mirrored so far are not downloaded again.
+
+        :rtype: :data:`MirrorResult`
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        previous_files = self._read_manifest()
+        files = dict(previous_files)
+        seen = set()
+        failed_folders = set()
+        result = MirrorResult([], [], [], [], [])
+        queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async def download():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                file, path, folder = item
+                entry = await self._download_file(file, path, folder, result)
+                if entry is not None:
+                    files[str(file.id)] = entry
+
+        workers = [asyncio.ensure_future(download()) for _ in range(self.concurrency)]
+        try:
+            listed = []
+            folders = [folder async for folder in self.context.get_folders()]
+            async for merged in merge(
+                ((folder, folder.get_files()) for folder in folders),
+                concurrency=self.folder_concurrency,
+            ):
+                folder, file, error = merged
+                if error is not None:
+                    failed_folders.add(folder.id)
+                    result.failed.append(("/".join(_folder_parts(folder)), error))
+                    continue
+                seen.add(str(file.id))
+                path = "/".join(_folder_parts(folder) + [_safe_name(file.display_name)])
+                listed.append((file, path, folder))
+
+            # Moves need the whole listing, to tell swaps from overwrites
+            for item in self._move_files(listed, previous_files, files, result):
+                await queue.put(item)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+            taken = {path for file, path, folder in listed}
+            for key, entry in previous_files.items():
+                if key in seen or entry["folder_id"] in failed_folders:
+                    continue
+                result.removed.append(entry["path"])
+                if entry["path"] in taken:
+                    # The local copy was replaced by another file already
+                    del files[key]
+                    continue
+                if not self.delete:
+                    files[key] = dict(entry, removed=True)
+                    continue
+                try:
+                    os.remove(self._local_path(entry["path"]))
+                except FileNotFoundError:
+                    pass
+                except OSError as error:
+                    result.failed.append((entry["path"], error))
+                    continue
+                del files[key]
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._write_manifest(files)
+
+        return result
+
+
+def _entry(file, path, folder):
+    entry = {"path": path, "folder_id": folder.id}
+    for attribute in _TRACKED_ATTRIBUTES:
+        entry[attribute] = getattr(file, attribute, None)
+    return entry
+
+
+def _folder_parts(folder):
+    # Full names start with the root folder, e.g. "course files/Week 1"
+    return [_safe_name(part) for part in folder.full_name.split("/")[1:]]
+
+
+def _safe_name(name):
+    if name in ("", ".", ".."):
+        return "_"
+    return name.replace("/", "_").replace("\\", "_")
@@ -1,45 +1,114 @@
 import re
 import asyncio
+import base64
+import bisect
+import inspect
+import json
+from collections import namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from typing import (
     overload,
-    Optional, Union, Generic, TypeVar, Type,
-    AsyncIterator, AsyncIterable, Awaitable,
+    Optional,
+    Union,
+    Generic,
+    TypeVar,
+    Type,
+    AsyncIterator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
     List,
 )
 from .requester import Requester
 
-
 T = TypeVar("T")
 TS = TypeVar("TS")
+
+
+class Page(List[T]):
+    """
+    The elements of one page of a :class:`PaginatedList`, together with the
+    metadata of the response that delivered them.
+    """
+
+    def __init__(
+        self,
+        elements: List[T],
+        url: str,
+        headers,
+        links: dict,
+        next_url: Optional[str],
+        number: Optional[int],
+    ):
+        """
+        :param elements: The elements of the page.
+        :param url: The URL the page was fetched from.
+        :param headers: The response headers.
+        :param links: The URLs of the pagination links, keyed by relation
+            (``next``, ``last``, ...).
+        :param next_url: The URL of the next page, relative to the API base URL,
+            or None on the last page.
+        :param number: The page number, if the endpoint uses numbered pagination.
+        """
+        super(Page, self).__init__(elements)
+        self.url = url
+        self.headers = headers
+        self.links = links
+        self.next_url = next_url
+        self.number = number
+
+
 class PaginatedList(AsyncIterable[T], Generic[T]):
     """
     Abstracts `pagination of Canvas API \
     <https://canvas.instructure.com/doc/api/file.pagination.html>`_.
     """
 
-    async def _async_getitem_single(self, index: int, fut: asyncio.Future) -> None:
+    async def __aiter__(self) -> AsyncIterator[T]:
+        index = 0
+        ahead = None  # background fetch of upcoming pages
         try:
-            await self._get_up_to_index(index)
-            fut.set_result(self._elements[index])
-        except Exception as e:
-            fut.set_exception(e)
+            while True:
+                if ahead is not None and ahead.done():
+                    ahead.result()  # propagate errors to the consumer
+                    ahead = None
+                if (
+                    ahead is None
+                    and self._has_next()
+                    and self._pages_after(index) < self.prefetch
+                ):
+                    ahead = asyncio.ensure_future(self._grow(self.concurrency))
+
+                if index < len(self._elements):
+                    yield self._elements[index]
+                    index += 1
+                elif ahead is not None:
+                    await ahead
+                elif self._has_next():
+                    await self._grow(self.concurrency)
+                else:
+                    return
+        finally:
+            if ahead is not None:
+                ahead.cancel()
 
     @overload
-    def __getitem__(self, index: int) -> Awaitable[T]: pass
+    def __getitem__(self, index: int) -> Awaitable[T]:
+        pass
+
     @overload
-    def __getitem__(self, index: slice) -> "PaginatedList._Slice[T]": pass
+    def __getitem__(self, index: slice) -> "PaginatedList._Slice[T]":
+        pass
 
     def __getitem__(self, index):
         assert isinstance(index, (int, slice))
         if isinstance(index, int):
             if index < 0:
                 raise IndexError("Cannot negative index a PaginatedList")
-            # Based on https://gist.github.com/achimnol/da6983838b31f6f188d539b9ce9ea5ba
-            loop = asyncio.get_running_loop()
-            fut = loop.create_future()
-            loop.create_task(self._async_getitem_single(index, fut))
-            return fut
+            # A Future rather than a coroutine, as callers may rely on it
+            return asyncio.ensure_future(self._get_item(index))
         else:
             return self._Slice(self, index)
 
@@ -51,14 +120,22 @@ class PaginatedList(AsyncIterable[T], Generic[T]):
         first_url: str,
         extra_attribs: Optional[dict] = None,
         _root=None,
+        _concurrency: Optional[int] = None,
+        _prefetch: Optional[int] = None,
+        _on_checkpoint: Optional[Callable] = None,
+        _checkpoint_every: int = 1,
         **kwargs
     ):
 
         self._elements = list()
+        # Cumulative number of elements at the end of each fetched page
+        self._page_ends = list()
 
         self._requester = requester
         self._content_class = content_class
         self._first_url = first_url
+        # Kept for validating checkpoints, since resuming moves `_first_url`
+        self._origin_url = first_url
         self._first_params = kwargs or {}
         self._first_params["per_page"] = kwargs.get("per_page", 100)
         self._next_url = first_url
@@ -66,33 +143,70 @@ class PaginatedList(AsyncIterable[T], Generic[T]):
         self._extra_attribs = extra_attribs or {}
         self._request_method = request_method
         self._root = _root
+        # Number of the last page, if the endpoint uses numbered pagination
+        self._last_page = None
+        # URL of some page and the page size, if the endpoint uses numbered
+        # pagination and reports its last page, so that any page can be
+        # fetched directly
+        self._page_url = None
+        self._page_size = None
+        # Fetches of pages requested directly, ahead of the sequentially
+        # retained elements, keyed by page number
+        self._sparse_pages = {}
+        # The sequential fetch in progress, shared by everybody who needs it,
+        # and the numbers of the pages it is fetching
+        self._growth = None
+        self._growing_pages = range(0)
 
-    async def __aiter__(self) -> AsyncIterator[T]:
-        for element in self._elements:
-            yield element
-        while self._has_next():
-            new_elements = await self._grow()
-            for element in new_elements:
-                yield element
+        #: Maximum number of pages fetched at once while iterating, when the
+        #: endpoint uses numbered pages (i.e., it returns a ``last`` link with a
+        #: numeric ``page`` parameter). Endpoints that paginate with opaque
+        #: bookmarks are always traversed one page at a time.
+        self.concurrency = (
+            _concurrency if _concurrency is not None else requester.page_concurrency
+        )
+        #: Number of pages to keep in flight ahead of the page being consumed
+        #: while iterating, so that fetching overlaps with processing.
+        self.prefetch = _prefetch if _prefetch is not None else requester.page_prefetch
+        #: Called with a checkpoint token (see :func:`checkpoint`) every
+        #: :attr:`checkpoint_every` pages consumed through :func:`stream` or
+        #: :func:`pages`, and once more at the end of the collection. May be
+        #: a coroutine function.
+        self.on_checkpoint = _on_checkpoint
+        self.checkpoint_every = _checkpoint_every
+        #: Number of elements that precede the first one of this list, when it
+        #: was resumed from a checkpoint.
+        self.offset = 0
 
     def __repr__(self) -> str:
         return "<PaginatedList of type {}>".format(self._content_class.__name__)
 
-    async def _get_next_page(self) -> List:
-        response = await self._requester.request(
-            self._request_method, self._next_url, **self._next_params
-        )
-        data = await response.json()
-        self._next_url = None
-
-        next_link = response.links.get("next")
-        regex = r"{}(.*)".format(re.escape(self._requester.base_url))
+    def _checkpoint_token(self, next_url: Optional[str], offset: int) -> str:
+        state = {"first_url": self._origin_url, "next_url": next_url, "offset": offset}
+        token = base64.urlsafe_b64encode(json.dumps(state).encode("utf-8"))
+        return token.decode("ascii")
 
-        self._next_url = (
-            re.search(regex, str(next_link["url"])).group(1) if next_link else None
-        )
+    async def _do_grow(self, max_pages: int) -> List:
+        new_elements = []
+        for page in await self._get_next_pages(max_pages):
+            if (
+                not self._page_ends
+                and self._last_page is not None
+                and _page_number(page.next_url) == 2
+            ):
+                self._page_url = page.next_url
+                self._page_size = len(page)
+            self._elements += page
+            self._page_ends.append(len(self._elements))
+            new_elements += page
+        return new_elements
 
-        self._next_params = {}
+    async def _fetch_page(self, url: str, params: dict) -> "Page[T]":
+        """
+        Fetch and decode one page, without changing the state of the list.
+        """
+        response = await self._requester.request(self._request_method, url, **params)
+        data = await response.json()
 
         content = []
 
@@ -104,7 +218,8 @@ class PaginatedList(AsyncIterable[T], Generic[T]):
                 raise ValueError("Invalid root value specified.")
 
         # XXX check; cf group.py:1071
-        if type(data) == dict:  # XXX playing it safe for now, consider "type(data) != list" later
+        # XXX playing it safe for now, consider "type(data) != list" later
+        if type(data) == dict:
             data = [data]
 
         for element in data:
@@ -112,44 +227,565 @@ class PaginatedList(AsyncIterable[T], Generic[T]):
                 element.update(self._extra_attribs)
                 content.append(self._content_class(self._requester, element))
 
-        return content
+        return Page(
+            content,
+            url=str(response.url),
+            headers=response.headers,
+            links={rel: str(link["url"]) for rel, link in response.links.items()},
+            next_url=self._relative_url(response.links.get("next", {}).get("url")),
+            number=_page_number(url),
+        )
+
+    async def _fetch_pages(self, url: str, params: dict, max_pages: int) -> tuple:
+        """
+        Fetch up to `max_pages` pages concurrently, if the endpoint uses numbered
+        pagination, or else just the page at `url`. Apart from remembering the
+        number of the last page, the state of the list is left unchanged.
+
+        :returns: The pages fetched, and the URL of the page that follows them
+            (None after the last page).
+        """
+        first = _page_number(url)
+        if max_pages > 1 and first is not None and self._last_page is not None:
+            numbers = range(first, min(first + max_pages, self._last_page + 1))
+        else:
+            numbers = range(1)
+
+        if len(numbers) <= 1:
+            pages = [await self._fetch_page(url, params)]
+        else:
+            pages = await asyncio.gather(
+                *(self._fetch_page(_with_page_number(url, n), params) for n in numbers)
+            )
+
+        for page in pages:
+            last_page = _page_number(self._relative_url(page.links.get("last")))
+            if last_page is not None:
+                self._last_page = last_page
+        # Follow the next link of the last page fetched, rather than trusting the
+        # ``last`` link of the first page, in case the collection grew meanwhile
+        return pages, pages[-1].next_url
+
+    async def _get_item(self, index: int) -> T:
+        if not self._page_ends and self._has_next():
+            await self._grow()  # the first page tells whether pages are numbered
+        if index < len(self._elements):
+            return self._elements[index]
+        if self._page_url is not None:
+            page = await self._get_page(index // self._page_size + 1)
+            return page[index % self._page_size]
+        await self._get_up_to_index(index)
+        return self._elements[index]
+
+    async def _get_next_page(self) -> "Page[T]":
+        return (await self._get_next_pages())[0]
+
+    async def _get_next_pages(self, max_pages: int = 1) -> "List[Page[T]]":
+        """
+        Fetch the next page(s) and advance the list past them.
+
+        :returns: The pages fetched.
+        """
+        first = _page_number(self._next_url)
+        fetch = self._sparse_pages.get(first)
+        if fetch is not None:
+            # Keep it visible to _get_page() until the page is retained
+            page = await asyncio.shield(fetch)
+            del self._sparse_pages[first]
+            self._next_url = page.next_url
+            return [page]
+
+        # Stop short of pages that were already requested directly
+        if first is not None:
+            max_pages = next(
+                (n for n in range(1, max_pages) if first + n in self._sparse_pages),
+                max_pages,
+            )
+            self._growing_pages = range(first, first + max_pages)
+        try:
+            pages, self._next_url = await self._fetch_pages(
+                self._next_url, self._next_params, max_pages
+            )
+        finally:
+            self._growing_pages = range(0)
+        self._next_params = {}
+        return pages
+
+    async def _get_page(self, number: int) -> "Page[T]":
+        """
+        Fetch a page by number, without fetching the pages before it. Only
+        valid once the first page showed that the endpoint uses numbered pages.
+
+        Concurrent requests for the same page share a single fetch, including
+        with the sequential fetch of :func:`_grow`.
+        """
+        if number <= len(self._page_ends):
+            start = self._page_ends[number - 2] if number > 1 else 0
+            end = self._page_ends[number - 1]
+            return self._elements[start:end]
+        if number > self._last_page:
+            raise IndexError("PaginatedList index out of range")
+        if number in self._growing_pages:
+            # Already being fetched in sequence: wait for it to be retained
+            await asyncio.shield(self._growth)
+            return await self._get_page(number)
+
+        fetch = self._sparse_pages.get(number)
+        if fetch is None:
+            fetch = asyncio.ensure_future(
+                self._fetch_page(_with_page_number(self._page_url, number), {})
+            )
+            self._sparse_pages[number] = fetch
+
+            def forget_failure(fetch):
+                if fetch.cancelled() or fetch.exception() is not None:
+                    if self._sparse_pages.get(number) is fetch:
+                        del self._sparse_pages[number]
+
+            fetch.add_done_callback(forget_failure)
+        # Shielded, so that a cancelled caller does not cancel the others
+        return await asyncio.shield(fetch)
 
     async def _get_up_to_index(self, index: int) -> None:
         while len(self._elements) <= index and self._has_next():
             await self._grow()
 
-    async def _grow(self) -> List:
-        new_elements = await self._get_next_page()
-        self._elements += new_elements
-        return new_elements
+    async def _grow(self, max_pages: int = 1) -> List:
+        """
+        Fetch the next page(s) and retain their elements. If a fetch is already
+        in progress, wait for it instead, so that several coroutines sharing the
+        list never fetch the same page twice.
+        """
+        if self._growth is None or self._growth.done():
+            self._growth = asyncio.ensure_future(self._do_grow(max_pages))
+        # Shielded, so that a cancelled caller does not cancel the others
+        return await asyncio.shield(self._growth)
 
     def _has_next(self) -> bool:
         return self._next_url is not None
 
-    def _is_larger_than(self, index: int) -> bool:
-        return len(self._elements) > index or self._has_next()
+    async def _iter_pages(
+        self,
+        url: Optional[str],
+        params: dict,
+        position: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> "AsyncIterator[Page[T]]":
+        """
+        Yield each page from `url` onwards, without retaining them, and report
+        checkpoints once the consumer is done with them if `position` (the
+        number of elements before `url`) is given.
+        """
+        count = 0
+        async for page in self._prefetch_pages(url, params, prefetch):
+            yield page
+            if position is None or self.on_checkpoint is None:
+                continue
+            position += len(page)
+            count += 1
+            if count % max(1, self.checkpoint_every) == 0 or page.next_url is None:
+                result = self.on_checkpoint(
+                    self._checkpoint_token(page.next_url, position)
+                )
+                if inspect.isawaitable(result):
+                    await result
+
+    def _pages_after(self, index: int) -> int:
+        """
+        Number of fetched pages that start after the given element index.
+        """
+        return max(
+            0, len(self._page_ends) - bisect.bisect_right(self._page_ends, index) - 1
+        )
+
+    async def _prefetch_pages(
+        self, url: Optional[str], params: dict, prefetch: Optional[int] = None
+    ) -> "AsyncIterator[Page[T]]":
+        """
+        Yield each page from `url` onwards. Up to `prefetch` pages (by default
+        :attr:`prefetch`) are buffered ahead of the consumer.
+        """
+        if prefetch is None:
+            prefetch = self.prefetch
+        if not prefetch:
+            while url is not None:
+                pages, url = await self._fetch_pages(url, params, self.concurrency)
+                params = {}
+                for page in pages:
+                    yield page
+            return
+
+        queue = asyncio.Queue(maxsize=prefetch)
+        done = object()
+
+        async def produce(url, params):
+            try:
+                while url is not None:
+                    pages, url = await self._fetch_pages(url, params, self.concurrency)
+                    params = {}
+                    for page in pages:
+                        await queue.put(page)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(done)
+
+        producer = asyncio.ensure_future(produce(url, params))
+        try:
+            while True:
+                page = await queue.get()
+                if page is done:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            producer.cancel()
+
+    def _relative_url(self, url) -> Optional[str]:
+        if not url:
+            return None
+        regex = r"{}(.*)".format(re.escape(self._requester.base_url))
+        return re.search(regex, str(url)).group(1)
+
+    async def _stream(self, prefetch: Optional[int] = None) -> AsyncIterator[T]:
+        """
+        Implement :func:`stream`, keeping up to `prefetch` pages (by default
+        :attr:`prefetch`) in flight.
+        """
+        for element in self._elements[:]:
+            yield element
+        position = self.offset + len(self._elements)
+        async for page in self._iter_pages(
+            self._next_url, self._next_params, position, prefetch
+        ):
+            for element in page:
+                yield element
+
+    async def batches(self, size: int) -> AsyncIterator[List[T]]:
+        """
+        Iterate over the collection in lists of `size` elements (the last one
+        may be shorter), regardless of the page size used by Canvas. Elements
+        are not retained in the list. Since batches may straddle pages, no
+        checkpoints are reported.
+
+        :param size: The number of elements per batch.
+        :type size: int
+        """
+        if size < 1:
+            raise ValueError("Batch size must be positive")
+        batch = []
+        async for page in self._iter_pages(self._first_url, self._first_params):
+            for element in page:
+                batch.append(element)
+                if len(batch) == size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def checkpoint(self) -> str:
+        """
+        Serialize the position of the list, i.e. the page after the elements
+        it has retained, so that a later process can carry on from there with
+        :func:`resume`. Elements that were retained are considered consumed,
+        including those prefetched ahead of an iteration; to checkpoint a crawl
+        precisely, iterate with :func:`stream` and set :attr:`on_checkpoint`.
+
+        :returns: An opaque token.
+        :rtype: str
+        """
+        return self._checkpoint_token(self._next_url, self.offset + len(self._elements))
+
+    async def count(self) -> int:
+        """
+        Count the elements in the collection.
+
+        For endpoints with numbered pages this only needs the first and the
+        last page. Otherwise the remaining pages are all fetched (honouring
+        :attr:`concurrency` and :attr:`prefetch`), but not retained.
+
+        :rtype: int
+        """
+        if not self._page_ends and self._has_next():
+            await self._grow()
+        if not self._has_next():
+            return len(self._elements)
+        if self._page_url is not None:
+            last_page = await self._get_page(self._last_page)
+            return (self._last_page - 1) * self._page_size + len(last_page)
+
+        total = len(self._elements)
+        async for page in self._iter_pages(self._next_url, self._next_params):
+            total += len(page)
+        return total
+
+    async def estimate_size(self) -> Optional[int]:
+        """
+        Estimate the number of elements in the collection, fetching at most the
+        first page.
+
+        The estimate is exact once all pages have been fetched. Otherwise, for
+        endpoints with numbered pages it is the number of pages times the page
+        size, which may exceed the true size by up to one page.
+
+        :returns: The estimate, or None if the endpoint gives no way to tell
+            without fetching every page.
+        :rtype: int
+        """
+        if not self._page_ends and self._has_next():
+            await self._grow()
+        if not self._has_next():
+            return len(self._elements)
+        if self._page_url is not None:
+            return self._last_page * self._page_size
+        return None
+
+    async def pages(self) -> "AsyncIterator[Page[T]]":
+        """
+        Iterate over the pages of the collection, from the first one, as they
+        arrive from Canvas. Each :class:`Page` is a list of elements that also
+        carries the metadata of the response that delivered it.
+
+        Like :func:`stream`, this honours :attr:`concurrency` and
+        :attr:`prefetch` (so the next pages can be in flight while a page is
+        being processed) and does not retain the pages in the list.
+        """
+        async for page in self._iter_pages(
+            self._first_url, self._first_params, self.offset
+        ):
+            yield page
+
+    def resume(self, token: str) -> "PaginatedList[T]":
+        """
+        Make a list that has not fetched anything yet start from a checkpoint.
+        The list must be built like the one the token came from, e.g. by
+        calling the same method with the same arguments.
+
+        Indices of the resumed list are relative to the checkpoint, and
+        :attr:`offset` tells how many elements precede it.
+
+        :param token: A token returned by :func:`checkpoint` or passed to
+            :attr:`on_checkpoint`.
+        :type token: str
+        :returns: The list itself.
+        :rtype: :class:`PaginatedList`
+        """
+        try:
+            state = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            first_url, next_url, offset = (
+                state["first_url"],
+                state["next_url"],
+                state["offset"],
+            )
+        except (AttributeError, TypeError, KeyError, ValueError):
+            raise ValueError("Invalid checkpoint token.")
+        if first_url != self._origin_url:
+            raise ValueError("Checkpoint token belongs to a different list.")
+        if self._elements or self._next_url != self._first_url:
+            raise ValueError("Cannot resume a list that was already fetched.")
+
+        if next_url != self._first_url:
+            self._first_url = next_url
+            self._first_params = {}
+            self._next_url = next_url
+            self._next_params = self._first_params
+        self.offset = offset
+        return self
+
+    async def stream(self) -> AsyncIterator[T]:
+        """
+        Iterate over the list without retaining the elements, so that a
+        one-pass crawl of a large collection runs in constant memory.
+
+        Elements the list already holds are yielded first; the remaining pages
+        are fetched on demand (honouring :attr:`concurrency` and
+        :attr:`prefetch`) and released as soon as they have been consumed. The
+        list itself is not advanced: indexing, slicing or iterating it later
+        fetches those pages again.
+        """
+        async for element in self._stream():
+            yield element
 
     class _Slice(AsyncIterable[TS], Generic[TS]):
-        def __init__(self, the_list: 'PaginatedList[TS]', the_slice: slice):
+        def __init__(self, the_list: "PaginatedList[TS]", the_slice: slice):
             self._list = the_list
             self._start = the_slice.start or 0
             self._stop = the_slice.stop
             self._step = the_slice.step or 1
 
-            if self._start < 0 or self._stop < 0:
+            if self._start < 0 or (self._stop is not None and self._stop < 0):
                 raise IndexError("Cannot negative index a PaginatedList slice")
 
         async def __aiter__(self) -> AsyncIterator[TS]:
+            the_list = self._list
             index = self._start
             while not self._finished(index):
-                if self._list._is_larger_than(index):
-                    try:
-                        yield (await self._list[index])
-                    except IndexError:
+                if not the_list._page_ends and the_list._has_next():
+                    await the_list._grow()
+                if index < len(the_list._elements):
+                    yield the_list._elements[index]
+                elif the_list._page_url is not None:
+                    # Jump straight to the pages covering the slice, fetching up
+                    # to `concurrency` of them at once
+                    size = the_list._page_size
+                    number = index // size + 1
+                    if number > the_list._last_page:
                         return
-                    index += self._step
+                    if number not in the_list._sparse_pages:
+                        await asyncio.gather(
+                            *(the_list._get_page(n) for n in self._page_numbers(index))
+                        )
+                    page = await the_list._get_page(number)
+                    if index % size >= len(page):
+                        return
+                    yield page[index % size]
                 else:
-                    return
+                    await the_list._get_up_to_index(index)
+                    if index >= len(the_list._elements):
+                        return
+                    yield the_list._elements[index]
+                index += self._step
 
         def _finished(self, index: int) -> bool:
             return self._stop is not None and index >= self._stop
+
+        def _page_numbers(self, index: int) -> List[int]:
+            """
+            Numbers of the next pages the slice needs, from `index` onwards.
+            """
+            the_list = self._list
+            numbers = []
+            while not self._finished(index) and len(numbers) < max(
+                1, the_list.concurrency
+            ):
+                number = index // the_list._page_size + 1
+                if number > the_list._last_page:
+                    break
+                if (
+                    number not in numbers
+                    and number not in the_list._sparse_pages
+                    and number > len(the_list._page_ends)
+                ):
+                    numbers.append(number)
+                index += self._step
+            return numbers
+
+
+#: An element yielded by :func:`merge`, tagged with the list it came from.
+#: ``error`` is set (and ``element`` is None) when that list failed.
+MergedElement = namedtuple("MergedElement", ["source", "element", "error"])
+
+
+async def merge(
+    sources: Union[Iterable, AsyncIterable],
+    concurrency: int = 10,
+    prefetch: Optional[int] = None,
+    return_exceptions: bool = True,
+) -> AsyncIterator[MergedElement]:
+    """
+    Crawl many paginated lists at once, yielding their elements as they arrive.
+
+    Each source is either a :class:`PaginatedList`, or a ``(tag, list)`` pair
+    whose tag is reported instead of the list, e.g.
+    ``((course, course.get_assignments()) for course in courses)``. Sources
+    are consumed lazily, so they may come from an async generator, and at
+    most `concurrency` lists are crawled at any time. Elements of the same
+    list are yielded in order and are not retained in the list (see
+    :func:`PaginatedList.stream`).
+
+    :param sources: The lists to crawl.
+    :type sources: iterable or async iterable
+    :param concurrency: Maximum number of lists crawled at the same time.
+    :type concurrency: int
+    :param prefetch: Number of pages each list keeps in flight ahead of its
+        consumer, overriding :attr:`PaginatedList.prefetch`.
+    :type prefetch: int
+    :param return_exceptions: Whether a failing list is reported as a
+        :data:`MergedElement` with its ``error`` set, while the other lists
+        carry on. Otherwise the first error is raised and the crawl stops.
+    :type return_exceptions: bool
+    :rtype: async iterator of :data:`MergedElement`
+    """
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be positive")
+
+    if isinstance(sources, AsyncIterable):
+        source_iter = sources.__aiter__()
+    else:
+        source_iter = iter(sources)
+    source_lock = asyncio.Lock()
+    exhausted = object()
+
+    async def next_source():
+        async with source_lock:
+            if isinstance(sources, AsyncIterable):
+                try:
+                    return await source_iter.__anext__()
+                except StopAsyncIteration:
+                    return exhausted
+            return next(source_iter, exhausted)
+
+    queue = asyncio.Queue(maxsize=concurrency)
+    finished = object()
+
+    async def crawl():
+        try:
+            while True:
+                source = await next_source()
+                if source is exhausted:
+                    break
+                tag, the_list = (
+                    source if isinstance(source, tuple) else (source, source)
+                )
+                try:
+                    async for element in the_list._stream(prefetch):
+                        await queue.put(MergedElement(tag, element, None))
+                except Exception as e:
+                    await queue.put(MergedElement(tag, None, e))
+        except Exception as e:
+            # The sources themselves failed, which cannot be isolated
+            await queue.put(e)
+        else:
+            await queue.put(finished)
+
+    workers = [asyncio.ensure_future(crawl()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            item = await queue.get()
+            if item is finished:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            elif item.error is not None and not return_exceptions:
+                raise item.error
+            else:
+                yield item
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+
+def _page_number(url: Optional[str]) -> Optional[int]:
+    """
+    Extract the numeric ``page`` parameter of a URL, if it has one.
+    """
+    if url is None:
+        return None
+    for name, value in parse_qsl(urlsplit(url).query):
+        if name == "page":
+            return int(value) if value.isdigit() else None
+    return None
+
+
+def _with_page_number(url: str, number: int) -> str:
+    """
+    Replace the ``page`` parameter of a URL.
+    """
+    parts = urlsplit(url)
+    query = [
+        (name, str(number) if name == "page" else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="[]")))
@@ -1,4 +1,9 @@
+import asyncio
+import heapq
+import itertools
+
 from canvasaio.canvas_object import CanvasObject
+from canvasaio.exceptions import ProgressFailed
 from canvasaio.util import combine_kwargs
 
 
@@ -6,6 +11,17 @@ class Progress(CanvasObject):
     def __str__(self):
         return "{} - {} ({})".format(self.tag, self.workflow_state, self.id)
 
+    def _finished(self):
+        """
+        Check whether the job has finished, as of the last query.
+
+        :raises: :class:`canvasaio.exceptions.ProgressFailed` if the job failed.
+        :rtype: bool
+        """
+        if self.workflow_state == "failed":
+            raise ProgressFailed(self)
+        return self.workflow_state == "completed"
+
     async def query(self, **kwargs):
         """
         Return completion and status information about an asynchronous job.
@@ -25,3 +41,245 @@ class Progress(CanvasObject):
         super(Progress, self).set_attributes(response_json)
 
         return Progress(self._requester, response_json)
+
+    async def wait(self, timeout=None, min_interval=0.5, max_interval=30.0, **kwargs):
+        """
+        Wait until the job has completed, querying it periodically. Intervals
+        start at `min_interval` and adapt to the rate at which the completion
+        of the job advances: polls get closer as the job nears its end, and
+        back off while it makes no progress.
+
+        To wait for many jobs at once, use a :class:`ProgressWaiter`.
+
+        :param timeout: Maximum number of seconds to wait, or None to wait
+            indefinitely.
+        :type timeout: float
+        :param min_interval: Minimum number of seconds between two queries.
+        :type min_interval: float
+        :param max_interval: Maximum number of seconds between two queries.
+        :type max_interval: float
+        :param kwargs: Parameters passed to each :func:`query`.
+        :raises: :class:`canvasaio.exceptions.ProgressFailed` if the job failed,
+            or :class:`asyncio.TimeoutError` if it did not complete in time.
+        :rtype: :class:`canvasaio.progress.Progress`
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        tracker = _CompletionTracker(self, min_interval, max_interval, loop.time())
+
+        while not self._finished():
+            delay = tracker.interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(
+                        "Job {} did not complete in time.".format(self.id)
+                    )
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+            await self.query(**kwargs)
+            tracker.update(loop.time())
+        return self
+
+
+class ProgressWaiter(object):
+    """
+    Wait for many asynchronous jobs with a single polling loop.
+
+    Jobs are queried when due, up to `concurrency` at a time, and each job's
+    interval adapts to its own completion rate, as with :func:`Progress.wait`.
+    The waiter can be used as an async context manager, which closes it on
+    exit.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def __init__(self, min_interval=0.5, max_interval=30.0, concurrency=10):
+        """
+        :param min_interval: Minimum number of seconds between two queries of
+            the same job.
+        :type min_interval: float
+        :param max_interval: Maximum number of seconds between two queries of
+            the same job.
+        :type max_interval: float
+        :param concurrency: Maximum number of queries in flight at once.
+        :type concurrency: int
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.concurrency = concurrency
+
+        # Heap of (time due, sequence number, tracker, future)
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._wakeup = None  # created lazily, since it must bind to the running loop
+        self._task = None
+
+    async def _poll(self, tracker, future):
+        if future.done():  # given up on by the caller
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await tracker.progress.query()
+            tracker.update(loop.time())
+            finished = tracker.progress._finished()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if future.done():
+            return
+        if finished:
+            future.set_result(tracker.progress)
+        else:
+            self._push(loop.time() + tracker.interval, tracker, future)
+
+    def _push(self, due, tracker, future):
+        heapq.heappush(self._schedule, (due, next(self._sequence), tracker, future))
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while self._schedule and self._schedule[0][3].done():
+                heapq.heappop(self._schedule)
+
+            # Nothing left to wait for: :func:`_push` starts a new loop
+            if not self._schedule:
+                return
+            self._wakeup.clear()
+            delay = self._schedule[0][0] - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = []
+            now = loop.time()
+            while (
+                self._schedule
+                and self._schedule[0][0] <= now
+                and len(due) < max(1, self.concurrency)
+            ):
+                due.append(heapq.heappop(self._schedule))
+            await asyncio.gather(*(self._poll(entry[2], entry[3]) for entry in due))
+
+    def add(self, progress):
+        """
+        Start tracking a job.
+
+        :param progress: The progress of the job.
+        :type progress: :class:`canvasaio.progress.Progress`
+        :returns: A future that resolves to the progress once the job has
+            completed, or raises :class:`canvasaio.exceptions.ProgressFailed`
+            if it failed. Cancelling the future stops tracking the job.
+        :rtype: :class:`asyncio.Future`
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            finished = progress._finished()
+        except ProgressFailed as e:
+            future.set_exception(e)
+            return future
+        if finished:
+            future.set_result(progress)
+            return future
+
+        tracker = _CompletionTracker(
+            progress, self.min_interval, self.max_interval, loop.time()
+        )
+        self._push(loop.time() + tracker.interval, tracker, future)
+        return future
+
+    async def close(self):
+        """
+        Stop the polling loop, and cancel the jobs still being waited for.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for entry in self._schedule:
+            entry[3].cancel()
+        self._schedule = []
+
+    async def wait(self, progresses, timeout=None, return_exceptions=False):
+        """
+        Wait until all the given jobs have completed.
+
+        :param progresses: The progress of each job.
+        :type progresses: iterable of :class:`canvasaio.progress.Progress`
+        :param timeout: Maximum number of seconds to wait, or None to wait
+            indefinitely.
+        :type timeout: float
+        :param return_exceptions: Whether errors, such as
+            :class:`canvasaio.exceptions.ProgressFailed`, should be returned in
+            place of the progress of the job, rather than raised.
+        :type return_exceptions: bool
+        :raises: :class:`asyncio.TimeoutError` if the jobs did not complete in
+            time; the jobs are then no longer tracked.
+        :rtype: list of :class:`canvasaio.progress.Progress`
+        """
+        futures = [self.add(progress) for progress in progresses]
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*futures, return_exceptions=return_exceptions), timeout
+            )
+        finally:
+            for future in futures:
+                future.cancel()
+            # Let the polling loop drop the jobs given up on, and end if idle
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+
+class _CompletionTracker(object):
+    """
+    Adapts the polling interval of a job to the rate at which its completion
+    advances.
+    """
+
+    def __init__(self, progress, min_interval, max_interval, now):
+        self.progress = progress
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._completion = _completion(progress)
+        self._polled_at = now
+
+    def update(self, now):
+        """
+        Compute the next interval after the job was queried.
+
+        :param now: The time of the query, in seconds.
+        :type now: float
+        """
+        completion = _completion(self.progress)
+        elapsed = now - self._polled_at
+        velocity = (completion - self._completion) / elapsed if elapsed > 0 else 0
+        if velocity > 0:
+            # Poll about twice before the estimated end of the job
+            interval = (100 - completion) / velocity / 2
+        else:
+            interval = self.interval * 2
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        self._completion = completion
+        self._polled_at = now
+
+
+def _completion(progress):
+    return getattr(progress, "completion", None) or 0
@@ -771,6 +771,9 @@ class QuizSubmissionEvent(CanvasObject):
 
 
 class QuizSubmissionQuestion(CanvasObject):
+    # Question ids are shared by all submissions of a quiz
+    _interned = False
+
     def __str__(self):
         return "QuizSubmissionQuestion #{}".format(self.id)
 
@@ -0,0 +1,208 @@
+import asyncio
+import time
+
+
+class RateLimiter(object):
+    """
+    Adaptive limit on the number of concurrent in-flight requests.
+
+    Canvas reports the state of each access token's `throttling bucket \
+    <https://canvas.instructure.com/doc/api/file.throttling.html>`_ through
+    the ``X-Rate-Limit-Remaining`` and ``X-Request-Cost`` response headers.
+    The limiter reads those headers and adjusts its window (the number of
+    requests allowed in flight at once) additively while the remaining quota
+    is comfortably high, and multiplicatively when the quota runs low or
+    Canvas starts throttling.
+
+    A single instance should be shared by all :class:`canvasaio.canvas.Canvas`
+    objects that use the same access token, since Canvas tracks quota per token.
+    """
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def __init__(
+        self,
+        initial_window=10,
+        min_window=1,
+        max_window=100,
+        low_watermark=200.0,
+        high_watermark=400.0,
+        decrease_factor=0.5,
+        cooldown=1.0,
+    ):
+        """
+        :param initial_window: Number of requests allowed in flight at start.
+        :type initial_window: int
+        :param min_window: Lower bound for the window.
+        :type min_window: int
+        :param max_window: Upper bound for the window.
+        :type max_window: int
+        :param low_watermark: Shrink the window when the remaining quota
+            drops below this value.
+        :type low_watermark: float
+        :param high_watermark: Grow the window while the remaining quota
+            stays above this value.
+        :type high_watermark: float
+        :param decrease_factor: Multiplier applied to the window when shrinking.
+        :type decrease_factor: float
+        :param cooldown: Minimum number of seconds between two consecutive
+            decreases caused by a low quota, so that one burst of responses
+            does not collapse the window.
+        :type cooldown: float
+        """
+        if not 1 <= min_window <= initial_window <= max_window:
+            raise ValueError(
+                "Window bounds must satisfy 1 <= min_window <= initial_window <= max_window"
+            )
+        if not 0 < decrease_factor < 1:
+            raise ValueError("`decrease_factor` must be between 0 and 1")
+
+        self.min_window = min_window
+        self.max_window = max_window
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self._window = initial_window
+        self._in_flight = 0
+        self._remaining = None
+        self._cost = None
+        self._last_decrease = None
+        self._condition = None  # created lazily, since it must bind to the running loop
+
+    def __repr__(self):
+        return "RateLimiter(window={}, in_flight={}, remaining={}, cost={})".format(
+            self._window, self._in_flight, self._remaining, self._cost
+        )
+
+    def _decrease(self, now):
+        self._last_decrease = now
+        self._window = max(self.min_window, int(self._window * self.decrease_factor))
+
+    def _get_condition(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        """
+        Wait until a slot in the window is available and claim it.
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self._window)
+            self._in_flight += 1
+
+    @property
+    def cost(self):
+        """
+        Moving average of the ``X-Request-Cost`` values reported by Canvas,
+        or None if no response carried it yet.
+
+        :rtype: float
+        """
+        return self._cost
+
+    @property
+    def in_flight(self):
+        """
+        The number of requests currently in flight.
+
+        :rtype: int
+        """
+        return self._in_flight
+
+    async def release(self):
+        """
+        Give back a slot claimed with :func:`acquire`.
+        """
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    @property
+    def remaining(self):
+        """
+        The most recent ``X-Rate-Limit-Remaining`` value reported by Canvas,
+        or None if no response carried it yet.
+
+        :rtype: float
+        """
+        return self._remaining
+
+    def throttled(self):
+        """
+        Shrink the window immediately, e.g. after Canvas rejected a request with
+        "403 Forbidden (Rate Limit Exceeded)".
+        """
+        self._decrease(time.monotonic())
+
+    async def update(self, headers):
+        """
+        Adjust the window according to the rate limit headers of a response.
+
+        :param headers: The response headers.
+        :type headers: dict
+        """
+        remaining, cost = parse_rate_limit_headers(headers)
+
+        if cost is not None:
+            self._cost = cost if self._cost is None else 0.8 * self._cost + 0.2 * cost
+
+        if remaining is None:
+            return
+        self._remaining = remaining
+
+        if remaining < self.low_watermark:
+            now = time.monotonic()
+            if (
+                self._last_decrease is None
+                or now - self._last_decrease >= self.cooldown
+            ):
+                self._decrease(now)
+        elif remaining >= self.high_watermark and self._window < self.max_window:
+            self._window += 1
+            condition = self._get_condition()
+            async with condition:
+                condition.notify_all()
+
+    @property
+    def window(self):
+        """
+        The number of requests currently allowed in flight.
+
+        :rtype: int
+        """
+        return self._window
+
+
+def parse_rate_limit_headers(headers):
+    """
+    Extract the throttling information Canvas attaches to a response.
+
+    :param headers: The response headers.
+    :type headers: dict
+    :returns: The ``X-Rate-Limit-Remaining`` and ``X-Request-Cost`` values,
+        each None if missing or malformed.
+    :rtype: tuple
+    """
+    return (
+        _parse_float(headers.get("X-Rate-Limit-Remaining")),
+        _parse_float(headers.get("X-Request-Cost")),
+    )
+
+
+def _parse_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
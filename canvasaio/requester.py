@@ -1,11 +1,18 @@
+import asyncio
+from collections import deque, namedtuple
 from datetime import datetime
+import hashlib
 import logging
 from pprint import pformat
+import time
+import weakref
 
 from typing import Optional
+from urllib.parse import urlencode, urlsplit
 
 import aiohttp
 
+from canvasaio.cache import CachedResponse, entry_from_response, validator_headers
 from canvasaio.exceptions import (
     BadRequest,
     CanvasException,
@@ -16,30 +23,159 @@ from canvasaio.exceptions import (
     Unauthorized,
     UnprocessableEntity,
 )
+from canvasaio.rate_limit import parse_rate_limit_headers
 from canvasaio.util import clean_headers
 
 
 logger = logging.getLogger(__name__)
 
 
+#: Summary of a completed request, kept in :attr:`Requester.journal` and
+#: attached as ``canvas_request`` to the "Response" log record. ``elapsed`` is
+#: the time in seconds until the response headers arrived (including any
+#: retries), ``size`` is the body length in bytes, or None if the server did not
+#: announce it. ``rate_limit_remaining`` and ``request_cost`` hold the values of
+#: the corresponding Canvas headers, if present.
+RequestRecord = namedtuple(
+    "RequestRecord",
+    [
+        "method",
+        "url",
+        "status",
+        "elapsed",
+        "size",
+        "rate_limit_remaining",
+        "request_cost",
+    ],
+)
+
+
 class Requester(object):
     """
     Responsible for handling HTTP requests.
     """
 
-    def __init__(self, base_url, access_token):
+    def __init__(
+        self,
+        base_url,
+        access_token,
+        *,
+        rate_limiter=None,
+        retry_policy=None,
+        journal_size=5,
+        cache=None,
+        coalesce=False,
+        page_concurrency=1,
+        page_prefetch=0,
+        lazy_objects=False,
+        compact_objects=False,
+        identity_map=False,
+        connector=None,
+        limit=100,
+        limit_per_host=0,
+        keepalive_timeout=15.0,
+        ttl_dns_cache=10,
+        connect_timeout=30,
+        read_timeout=None
+    ):
         """
         :param base_url: The base URL of the Canvas instance's API.
         :type base_url: str
         :param access_token: The API key to authenticate requests with.
         :type access_token: str
+        :param rate_limiter: Optional adaptive limit on the number of requests in
+            flight. Share one instance between all requesters using the same token.
+        :type rate_limiter: :class:`canvasaio.rate_limit.RateLimiter`
+        :param retry_policy: Optional policy for retrying throttled requests and
+            transient server errors. Without one, no request is ever retried.
+        :type retry_policy: :class:`canvasaio.retry.RetryPolicy`
+        :param journal_size: Number of :class:`RequestRecord` entries to keep in
+            :attr:`journal`.
+        :type journal_size: int
+        :param cache: Optional store for GET responses that carry an ``ETag`` or
+            ``Last-Modified`` validator. Cached resources are revalidated with
+            conditional requests, and a "304 Not Modified" answer is served from
+            the cache. Any other request to a path drops the cached entries for
+            that path and its parent collection.
+        :type cache: :class:`canvasaio.cache.BaseCache`
+        :param coalesce: Whether concurrent identical GET requests to the Canvas
+            API should share a single HTTP request. Every caller then receives
+            the same response object, whose body has already been read.
+        :type coalesce: bool
+        :param page_concurrency: Default number of pages a
+            :class:`canvasaio.paginated_list.PaginatedList` fetches at once
+            while iterating an endpoint with numbered pages.
+        :type page_concurrency: int
+        :param page_prefetch: Default number of pages a
+            :class:`canvasaio.paginated_list.PaginatedList` keeps in flight ahead
+            of the page being consumed while iterating.
+        :type page_prefetch: int
+        :param lazy_objects: Whether objects built from API responses should
+            resolve their attributes from the decoded JSON on access, rather than
+            copying every field when they are created. This saves time and memory
+            for wide payloads of which only a few fields are used.
+        :type lazy_objects: bool
+        :param compact_objects: Whether high-volume types that have a slotted
+            variant (such as :class:`canvasaio.submission.Submission`) should be
+            built as that variant, which uses far less memory per object. Such
+            objects are never lazy.
+        :type compact_objects: bool
+        :param identity_map: Whether objects of the same type and id should be
+            shared: building an object while an instance with the same type and
+            id is still referenced returns that instance, updated with the new
+            attributes. The instances are held by :attr:`identity_map` through
+            weak references only.
+        :type identity_map: bool
+        :param connector: Optional connector to share between several requesters,
+            so that they reuse the same pool of warm connections. A shared
+            connector is not closed by :func:`close`; its owner must close it.
+            When given, the pool settings below are ignored.
+        :type connector: :class:`aiohttp.BaseConnector`
+        :param limit: Maximum number of simultaneous connections (0 for no limit).
+        :type limit: int
+        :param limit_per_host: Maximum number of simultaneous connections to the
+            same host (0 for no limit).
+        :type limit_per_host: int
+        :param keepalive_timeout: Seconds to keep idle connections open for reuse.
+        :type keepalive_timeout: float
+        :param ttl_dns_cache: Seconds to cache DNS lookups (None to cache forever).
+        :type ttl_dns_cache: int
+        :param connect_timeout: Seconds allowed to establish a connection (None
+            for no limit other than the overall five minutes per request).
+        :type connect_timeout: float
+        :param read_timeout: Seconds allowed between two reads from a connection
+            (None for no limit).
+        :type read_timeout: float
         """
         # Preserve the original base url and add "/api/v1" to it
         self.original_url = base_url
         self.base_url = base_url + "/api/v1/"
         self.access_token = access_token
         self.__session = None  # defer construction of ClientSession, since that needs to be done in async context
-        self._cache = []
+        self.journal = deque(maxlen=journal_size)
+        self.cache = cache
+        self.coalesce = coalesce
+        self._in_flight = {}
+        self.page_concurrency = page_concurrency
+        self.page_prefetch = page_prefetch
+        self.lazy_objects = lazy_objects
+        self.compact_objects = compact_objects
+        #: Objects in use, keyed by type and id, if `identity_map` is enabled.
+        self.identity_map = weakref.WeakValueDictionary() if identity_map else None
+        # Keeps entries of different users apart in a shared cache
+        self._cache_namespace = hashlib.sha256(access_token.encode()).hexdigest()[:16]
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self._connector = connector
+        self._connector_settings = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+        self._timeout = aiohttp.ClientTimeout(
+            total=5 * 60, sock_connect=connect_timeout, sock_read=read_timeout
+        )
 
     @property
     async def _session(self):
@@ -47,7 +183,16 @@ class Requester(object):
         Deferred creation of aiohttp.ClientSession, since this needs to be done from async context
         """
         if self.__session == None:
-            self.__session = aiohttp.ClientSession()
+            if self._connector is not None:
+                connector, connector_owner = self._connector, False
+            else:
+                connector = aiohttp.TCPConnector(**self._connector_settings)
+                connector_owner = True
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=connector_owner,
+                timeout=self._timeout,
+            )
         return self.__session
 
     async def close(self):
@@ -83,6 +228,21 @@ class Requester(object):
         session = await self._session
         return await session.get(url, headers=headers, params=params)
 
+    async def _invalidate_cache(self, url):
+        """
+        Drop the cached entries of a resource and of its parent collection.
+        """
+        path = urlsplit(url).path.rstrip("/")
+        await self.cache.invalidate(path)
+        await self.cache.invalidate(path.rsplit("/", 1)[0])
+
+    @staticmethod
+    async def _is_rate_limited(response):
+        """
+        Check whether a 403 response is Canvas' "Rate Limit Exceeded" rejection.
+        """
+        return "Rate Limit Exceeded" in await response.text()
+
     async def _patch_request(self, url, headers, data=None, **kwargs):
         """
         Issue a PATCH request to the specified endpoint with the data provided.
@@ -115,21 +275,33 @@ class Requester(object):
         if json:
             return await session.post(url, headers=headers, json=dict(data))
 
-        # Grab file from data.
+        # Split the file from the form fields in a single pass, leaving the
+        # caller's list intact
+        fields = []
         files = None
         for field, value in data:
-            if field == "file":
-                if isinstance(value, dict):
-                    files = value
-                else:
-                    files = {"file": value}
-                break
-
-        # Remove file entry from data.
-        # XXX This contradicts type of "data" in docstring (can't hash a slice...)
-        #   So, apparently data must me a list of tuples
-        # XXX It appears that this functionality isn't actually used by the API...?
-        data[:] = [tup for tup in data if tup[0] != "file"]
+            if field != "file":
+                fields.append((field, value))
+            elif isinstance(value, dict):
+                files = value
+            else:
+                files = {"file": value}
+
+        # Streamed payloads (see :class:`canvasaio.upload.Uploader`) are written
+        # part by part, so the file is never held in memory
+        if files is not None and any(
+            isinstance(value, aiohttp.payload.Payload) for value in files.values()
+        ):
+            writer = aiohttp.MultipartWriter("form-data")
+            for field, value in fields:
+                part = writer.append(str(value))
+                part.set_content_disposition("form-data", name=field)
+            for filename, value in files.items():
+                part = writer.append_payload(value)
+                part.set_content_disposition(
+                    "form-data", name=filename, filename=value.filename or filename
+                )
+            return await session.post(url, headers=headers, data=writer)
 
         # TODO Check if this can be simplified
         #    According to request lib docs, files must be a dict with file-like value type
@@ -138,7 +310,7 @@ class Requester(object):
         #   Instead, we're playing safe (since I have no tide to investigate -- e.g., can a
         #   file attachment and a form field share names?)
         form_data = aiohttp.FormData()
-        for field, value in data:
+        for field, value in fields:
             form_data.add_field(field, value)
         if files is not None:
             for filename, value in files.items():
@@ -160,6 +332,204 @@ class Requester(object):
         session = await self._session
         return await session.put(url, headers=headers, data=data)
 
+    async def _request(
+        self, method, req_method, full_url, headers, _kwargs, json, _idempotent, _max_retries, _url
+    ):
+        """
+        Issue a prepared request, going through the cache if one is configured,
+        and raise for error statuses.
+        """
+        # Only requests to the Canvas API itself are cached, never file
+        # downloads and uploads to external storage
+        cache_key = cache_entry = None
+        if self.cache is not None and method == "GET" and not _url:
+            cache_key = self._request_key(full_url, _kwargs)
+            cache_entry = await self.cache.get(cache_key)
+            if cache_entry is not None:
+                headers = dict(headers, **validator_headers(cache_entry))
+
+        # Call the request method
+        logger.info("Request: %s %s", method, full_url)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Headers: %s", pformat(clean_headers(headers)))
+            if _kwargs:
+                logger.debug("Data: %s", pformat(_kwargs))
+
+        start = time.monotonic()
+        response = await self._send_with_retries(
+            method, req_method, full_url, headers, _kwargs, json, _idempotent, _max_retries
+        )
+        remaining, cost = parse_rate_limit_headers(response.headers)
+        record = RequestRecord(
+            method=method,
+            url=full_url,
+            status=response.status,
+            elapsed=time.monotonic() - start,
+            size=response.content_length,
+            rate_limit_remaining=remaining,
+            request_cost=cost,
+        )
+        # Newest first; the deque discards the oldest record once full
+        self.journal.appendleft(record)
+        logger.info(
+            "Response: %s %s %s (%s bytes, %.1f ms)",
+            method,
+            full_url,
+            response.status,
+            "?" if record.size is None else record.size,
+            record.elapsed * 1000,
+            extra={"canvas_request": record},
+        )
+
+        # Only decode the body for logging when somebody is listening, and
+        # leave responses from external storage unread so that file
+        # downloads can be streamed
+        if debug:
+            logger.debug("Headers: %s", pformat(clean_headers(response.headers)))
+        if debug and not _url:
+            try:
+                logger.debug("Data: %s", pformat(await response.json(content_type=None)))
+            except ValueError:
+                logger.debug("Data: %s", pformat(await response.text()))
+
+        if cache_key is not None:
+            if response.status == 304 and cache_entry is not None:
+                response.release()
+                response = CachedResponse(cache_entry)
+            elif response.status == 200:
+                entry = entry_from_response(
+                    response, await response.read(), urlsplit(full_url).path.rstrip("/")
+                )
+                if entry is not None:
+                    await self.cache.set(cache_key, entry)
+        elif self.cache is not None and method != "GET" and not _url:
+            # Requests to external storage never change API resources
+            await self._invalidate_cache(full_url)
+
+        # Raise for status codes
+        if response.status == 400:
+            raise BadRequest(await response.text())
+        elif response.status == 401:
+            if "WWW-Authenticate" in response.headers:
+                raise InvalidAccessToken(await response.json())
+            else:
+                raise Unauthorized(await response.json())
+        elif response.status == 403:
+            raise Forbidden(await response.text())
+        elif response.status == 404:
+            raise ResourceDoesNotExist("Not Found")
+        elif response.status == 409:
+            raise Conflict(await response.text())
+        elif response.status == 422:
+            raise UnprocessableEntity(await response.text())
+        elif response.status > 400:
+            # generic catch-all for error codes
+            raise CanvasException(
+                "Encountered an error: status code {}".format(response.status)
+            )
+
+        return response
+
+    def _request_key(self, url, params):
+        """
+        Build the key identifying a GET request, for caching and coalescing.
+        Parameters are ordered by name, keeping the relative order of repeated
+        names (e.g. ``include[]``).
+        """
+        query = urlencode(sorted(params, key=lambda param: param[0]))
+        return "{} {}?{}".format(self._cache_namespace, url, query)
+
+    async def _send(self, req_method, url, headers, data, json):
+        """
+        Issue a request through the rate limiter, if one is configured.
+        """
+        if self.rate_limiter is None:
+            return await req_method(url, headers, data, json=json)
+
+        await self.rate_limiter.acquire()
+        try:
+            response = await req_method(url, headers, data, json=json)
+        finally:
+            await self.rate_limiter.release()
+        await self.rate_limiter.update(response.headers)
+        return response
+
+    async def _send_with_retries(
+        self, method, req_method, url, headers, data, json, idempotent, max_retries
+    ):
+        """
+        Issue a request, repeating it according to the retry policy while it
+        fails with a throttling response, a transient server error, or a
+        connection error.
+        """
+        policy = self.retry_policy
+        if policy is None or not policy.allows_method(method, idempotent):
+            budget = 0
+        else:
+            budget = policy.max_retries if max_retries is None else max_retries
+
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self._send(req_method, url, headers, data, json)
+            except aiohttp.ClientSSLError:
+                # Certificate and handshake failures do not go away on retry
+                raise
+            except (
+                aiohttp.ClientConnectorError,
+                aiohttp.ServerConnectionError,
+                asyncio.TimeoutError,
+            ) as e:
+                if attempt >= budget:
+                    if budget:
+                        policy.exhausted += 1
+                    raise
+                reason = type(e).__name__
+            else:
+                rate_limited = response.status == 403 and await self._is_rate_limited(
+                    response
+                )
+                if rate_limited and self.rate_limiter is not None:
+                    self.rate_limiter.throttled()
+                if policy is None or not policy.allows_status(
+                    response.status, rate_limited
+                ):
+                    return response
+                if attempt >= budget:
+                    if budget:
+                        policy.exhausted += 1
+                    return response
+                reason = response.status
+                retry_after = response.headers.get("Retry-After")
+                response.release()
+
+            delay = policy.backoff(attempt, retry_after)
+            policy.record(reason)
+            attempt += 1
+            logger.warning(
+                "Retrying {method} {url} in {delay:.2f}s "
+                "({reason}, retry {attempt} of {budget})".format(
+                    method=method,
+                    url=url,
+                    delay=delay,
+                    reason=reason,
+                    attempt=attempt,
+                    budget=budget,
+                )
+            )
+            await asyncio.sleep(delay)
+
+    async def _shared_request(self, *args):
+        """
+        Issue a request whose response may be handed to several callers. The
+        body is read up front, so that each caller can decode it independently.
+        """
+        response = await self._request(*args)
+        await response.read()
+        return response
+
     async def request(
         self,
         method: str,
@@ -169,6 +539,8 @@ class Requester(object):
         _url: Optional[str] = None,
         _kwargs: list = None,
         json: bool = False,
+        _idempotent: bool = False,
+        _max_retries: Optional[int] = None,
         **kwargs
     ) -> aiohttp.ClientResponse:
         """
@@ -195,6 +567,10 @@ class Requester(object):
             currently only the POST request of GraphQL is using this parameter.
             For all other methods it's just passed and ignored.
         :type json: `bool`
+        :param _idempotent: Mark a PUT or DELETE request as safe to retry.
+        :type _idempotent: `bool`
+        :param _max_retries: Override the retry policy's budget for this request.
+        :type _max_retries: `int`
         :rtype: str
         """
         full_url = _url if _url else "{}{}".format(self.base_url, endpoint)
@@ -238,58 +614,21 @@ class Requester(object):
         else:
             raise ValueError(f"Invalid HTTP request method: {method}")
 
-        # Call the request method
-        logger.info("Request: {method} {url}".format(method=method, url=full_url))
-        logger.debug(
-            "Headers: {headers}".format(headers=pformat(clean_headers(headers)))
+        if self.coalesce and method == "GET" and not _url:
+            key = self._request_key(full_url, _kwargs)
+            future = self._in_flight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(
+                    self._shared_request(
+                        method, req_method, full_url, headers, _kwargs, json,
+                        _idempotent, _max_retries, _url,
+                    )
+                )
+                self._in_flight[key] = future
+                future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            # Shielded, so that a cancelled caller does not cancel the others
+            return await asyncio.shield(future)
+
+        return await self._request(
+            method, req_method, full_url, headers, _kwargs, json, _idempotent, _max_retries, _url
         )
-
-        if _kwargs:
-            logger.debug("Data: {data}".format(data=pformat(_kwargs)))
-
-        response = await req_method(full_url, headers, _kwargs, json=json)
-        logger.info(
-            "Response: {method} {url} {status}".format(
-                method=method, url=full_url, status=response.status
-            )
-        )
-        logger.debug(
-            "Headers: {headers}".format(
-                headers=pformat(clean_headers(response.headers))
-            )
-        )
-
-        try:
-            logger.debug("Data: {data}".format(data=pformat(await response.json())))
-        except ValueError:
-            logger.debug("Data: {data}".format(data=pformat(await response.text())))
-
-        # Add response to internal cache
-        if len(self._cache) > 4:
-            self._cache.pop()
-
-        self._cache.insert(0, response)
-
-        # Raise for status codes
-        if response.status == 400:
-            raise BadRequest(await response.text())
-        elif response.status == 401:
-            if "WWW-Authenticate" in response.headers:
-                raise InvalidAccessToken(await response.json())
-            else:
-                raise Unauthorized(await response.json())
-        elif response.status == 403:
-            raise Forbidden(await response.text())
-        elif response.status == 404:
-            raise ResourceDoesNotExist("Not Found")
-        elif response.status == 409:
-            raise Conflict(await response.text())
-        elif response.status == 422:
-            raise UnprocessableEntity(await response.text())
-        elif response.status > 400:
-            # generic catch-all for error codes
-            raise CanvasException(
-                "Encountered an error: status code {}".format(response.status)
-            )
-
-        return response
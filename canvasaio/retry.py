@@ -0,0 +1,164 @@
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+
+
+class RetryPolicy(object):
+    """
+    Decide whether, and after how long, a failed request should be repeated.
+
+    Delays follow "full jitter" exponential backoff: before retry number ``n``
+    (counting from zero) the requester sleeps for a random duration between
+    zero and ``min(max_backoff, backoff_factor * 2 ** n)`` seconds. When the
+    response carries a ``Retry-After`` header, that delay is honoured instead
+    if it is longer, up to ``max_retry_after`` seconds.
+
+    Only requests that are safe to repeat are retried: by default GET, plus
+    PUT and DELETE requests that the caller explicitly marks as idempotent.
+    """
+
+    #: Statuses that are always worth retrying.
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=60.0,
+        max_retry_after=None,
+        statuses=RETRY_STATUSES,
+        methods=("GET",),
+        idempotent_methods=("PUT", "DELETE"),
+        retry_rate_limited=True,
+    ):
+        """
+        :param max_retries: Default number of retries allowed per request.
+        :type max_retries: int
+        :param backoff_factor: Base delay, in seconds, of the backoff.
+        :type backoff_factor: float
+        :param max_backoff: Upper bound, in seconds, of a computed delay.
+        :type max_backoff: float
+        :param max_retry_after: Upper bound, in seconds, of a delay requested
+            by a ``Retry-After`` header. Defaults to `max_backoff`.
+        :type max_retry_after: float
+        :param statuses: HTTP status codes that trigger a retry.
+        :type statuses: tuple of int
+        :param methods: HTTP methods that are always retried.
+        :type methods: tuple of str
+        :param idempotent_methods: HTTP methods that are retried only when
+            the request is explicitly marked as idempotent.
+        :type idempotent_methods: tuple of str
+        :param retry_rate_limited: Whether to retry
+            "403 Forbidden (Rate Limit Exceeded)" responses.
+        :type retry_rate_limited: bool
+        """
+        if max_retries < 0:
+            raise ValueError("`max_retries` must not be negative")
+
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = (
+            max_backoff if max_retry_after is None else max_retry_after
+        )
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.retry_rate_limited = retry_rate_limited
+
+        #: Total number of retries performed.
+        self.retries = 0
+        #: Number of retries performed, keyed by status code or exception name.
+        self.retries_by_reason = Counter()
+        #: Number of requests that failed after using up their retry budget.
+        self.exhausted = 0
+
+    def __repr__(self):
+        return "RetryPolicy(max_retries={}, retries={}, exhausted={})".format(
+            self.max_retries, self.retries, self.exhausted
+        )
+
+    def allows_method(self, method, idempotent=False):
+        """
+        Check whether requests with the given method may be retried.
+
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param idempotent: Whether the caller marked the request as idempotent.
+        :type idempotent: bool
+        :rtype: bool
+        """
+        return method in self.methods or (
+            idempotent and method in self.idempotent_methods
+        )
+
+    def allows_status(self, status, rate_limited=False):
+        """
+        Check whether a response with the given status should be retried.
+
+        :param status: The HTTP status code of the response.
+        :type status: int
+        :param rate_limited: Whether the response was a rate-limit rejection.
+        :type rate_limited: bool
+        :rtype: bool
+        """
+        if status == 403:
+            return rate_limited and self.retry_rate_limited
+        return status in self.statuses
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Compute the delay before the given retry.
+
+        :param attempt: Zero-based index of the upcoming retry.
+        :type attempt: int
+        :param retry_after: Value of the ``Retry-After`` response header, if any.
+        :type retry_after: str
+        :returns: The delay in seconds.
+        :rtype: float
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_retry_after))
+        return delay
+
+    def record(self, reason):
+        """
+        Count a retry.
+
+        :param reason: The status code or exception name that caused it.
+        :type reason: int or str
+        """
+        self.retries += 1
+        self.retries_by_reason[reason] += 1
+
+
+def parse_retry_after(value):
+    """
+    Parse a ``Retry-After`` header, given either as a number of seconds or as
+    an HTTP date.
+
+    :param value: The header value.
+    :type value: str
+    :returns: The delay in seconds, or None if missing or malformed.
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -1,4 +1,4 @@
-from canvasaio.canvas_object import CanvasObject
+from canvasaio.canvas_object import CanvasObject, compact_class
 from canvasaio.paginated_list import PaginatedList
 from canvasaio.peer_review import PeerReview
 from canvasaio.upload import Uploader
@@ -171,16 +171,69 @@ class Submission(CanvasObject):
         return response
 
 
+#: Slotted variant of :class:`Submission`, used instead of it when the
+#: requester was created with ``compact_objects=True``.
+CompactSubmission = compact_class(
+    Submission,
+    (
+        "anonymous_id",
+        "assignment",
+        "assignment_id",
+        "assignment_visible",
+        "attachments",
+        "attempt",
+        "body",
+        "cached_due_date",
+        "course",
+        "course_id",
+        "discussion_entries",
+        "entered_grade",
+        "entered_score",
+        "excused",
+        "extra_attempts",
+        "grade",
+        "grade_matches_current_submission",
+        "graded_at",
+        "grader_id",
+        "grading_period_id",
+        "group",
+        "html_url",
+        "id",
+        "late",
+        "late_policy_status",
+        "media_comment",
+        "missing",
+        "points_deducted",
+        "posted_at",
+        "preview_url",
+        "read_status",
+        "redo_request",
+        "rubric_assessment",
+        "score",
+        "seconds_late",
+        "submission_comments",
+        "submission_history",
+        "submission_type",
+        "submitted_at",
+        "url",
+        "user",
+        "user_id",
+        "workflow_state",
+    ),
+)
+
+
 class GroupedSubmission(CanvasObject):
+    _nested_attributes = {
+        "submissions": lambda requester, submissions: [
+            Submission(requester, submission) for submission in submissions
+        ]
+    }
+
     def __init__(self, requester, attributes):
         super(GroupedSubmission, self).__init__(requester, attributes)
 
-        try:
-            self.submissions = [
-                Submission(requester, submission)
-                for submission in attributes["submissions"]
-            ]
-        except KeyError:
+        if "submissions" not in attributes:
             self.submissions = list()
 
     def __str__(self):
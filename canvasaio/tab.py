@@ -3,6 +3,9 @@ from canvasaio.util import combine_kwargs
 
 
 class Tab(CanvasObject):
+    # Tab ids, such as "home", are only unique within a course or group
+    _interned = False
+
     def __str__(self):
         return "{} ({})".format(self.label, self.id)
 
@@ -1,33 +1,65 @@
+import asyncio
+from collections.abc import AsyncIterable
+import inspect
+import io
 import json
 import os
 
+import aiohttp
+
 from canvasaio.util import combine_kwargs
 
+#: Default number of bytes read from the file at a time when uploading.
+UPLOAD_BUFFER_SIZE = 64 * 1024
+
 
 class Uploader(object):
     """
     Upload a file to Canvas.
     """
 
-    def __init__(self, requester, url, file, **kwargs):
+    def __init__(
+        self,
+        requester,
+        url,
+        file,
+        buffer_size=UPLOAD_BUFFER_SIZE,
+        progress=None,
+        **kwargs
+    ):
         """
         :param requester: The :class:`canvasaio.requester.Requester` to pass requests through.
         :type requester: :class:`canvasaio.requester.Requester`
         :param url: The URL to upload the file to.
         :type url: str
-        :param file: A file handler or path of the file to upload.
-        :type file: file or str
+        :param file: A file handler or path of the file to upload, or an async
+            iterable of bytes. An iterable requires the ``name`` keyword
+            argument, and should be given its ``size`` too: without it, the
+            upload is sent with chunked encoding, which some storage services
+            reject.
+        :type file: file, str, or async iterable of bytes
+        :param buffer_size: The number of bytes read from the file at a time.
+            The file is streamed, so this bounds the memory used by the upload.
+        :type buffer_size: int
+        :param progress: Called after every chunk with the number of bytes
+            sent so far and the total size (None if unknown). May be a
+            coroutine function.
+        :type progress: callable
         """
-        if isinstance(file, str):
+        if isinstance(file, (str, os.PathLike)):
             if not os.path.exists(file):
-                raise IOError("File " + file + " does not exist.")
+                raise IOError("File " + os.fspath(file) + " does not exist.")
             self._using_filename = True
         else:
             self._using_filename = False
+        if isinstance(file, AsyncIterable) and "name" not in kwargs:
+            raise ValueError("Uploading from an async iterable requires a `name`.")
 
         self._requester = requester
         self.url = url
         self.file = file
+        self.buffer_size = buffer_size
+        self.progress = progress
         self.kwargs = kwargs
 
     async def request_upload_token(self, file):
@@ -39,8 +71,9 @@ class Uploader(object):
             and the JSON response from the API.
         :rtype: tuple
         """
-        self.kwargs["name"] = os.path.basename(file.name)
-        self.kwargs["size"] = os.fstat(file.fileno()).st_size
+        if not isinstance(file, AsyncIterable):
+            self.kwargs["name"] = os.path.basename(file.name)
+            self.kwargs["size"] = os.fstat(file.fileno()).st_size
 
         response = await self._requester.request(
             "POST", self.url, _kwargs=combine_kwargs(**self.kwargs)
@@ -70,7 +103,8 @@ class Uploader(object):
 
         :param response: The response from the upload request.
         :type response: dict
-        :param file: A file handler pointing to the file to upload.
+        :param file: A file handler pointing to the file to upload, or an
+            async iterable of bytes.
         :returns: True if the file uploaded successfully, False otherwise, \
             and the JSON response from the API.
         :rtype: tuple
@@ -83,12 +117,27 @@ class Uploader(object):
             raise ValueError("Bad API response. No upload_params.")
 
         kwargs = response.get("upload_params")
+        if isinstance(file, AsyncIterable):
+            payload = _StreamPayload(
+                file,
+                self.kwargs.get("size"),
+                self.progress,
+                filename=self.kwargs["name"],
+            )
+        else:
+            file = _binary_file(file)
+            payload = _StreamPayload(
+                _read_chunks(file, self.buffer_size),
+                _remaining_size(file),
+                self.progress,
+                filename=os.path.basename(file.name),
+            )
 
         response = await self._requester.request(
             "POST",
             use_auth=False,
             _url=response.get("upload_url"),
-            file=file,
+            file=payload,
             _kwargs=combine_kwargs(**kwargs),
         )
 
@@ -96,3 +145,73 @@ class Uploader(object):
         response_json = json.loads((await response.text()).lstrip("while(1);"))
 
         return ("url" in response_json, response_json)
+
+
+class _StreamPayload(aiohttp.payload.Payload):
+    """
+    Multipart payload that writes an async iterable of chunks as they come,
+    reporting progress and holding its declared size to account.
+    """
+
+    def __init__(self, chunks, size, progress, **kwargs):
+        super(_StreamPayload, self).__init__(chunks, **kwargs)
+        self._size = size
+        self._progress = progress
+
+    def decode(self, encoding="utf-8", errors="strict"):
+        raise TypeError("A streamed upload cannot be decoded")
+
+    async def write(self, writer):
+        sent = 0
+        async for chunk in self._value:
+            sent += len(chunk)
+            if self._size is not None and sent > self._size:
+                raise ValueError(
+                    "Upload is larger than its declared size of {} bytes".format(
+                        self._size
+                    )
+                )
+            await writer.write(chunk)
+            if self._progress is not None:
+                result = self._progress(sent, self._size)
+                if inspect.isawaitable(result):
+                    await result
+        if self._size is not None and sent != self._size:
+            raise ValueError(
+                "Upload is smaller than its declared size of {} bytes".format(
+                    self._size
+                )
+            )
+
+
+def _binary_file(file):
+    # Text files backed by a binary one are sent as the bytes they hold, so
+    # that the size of the upload is known
+    if isinstance(file, io.TextIOBase) and hasattr(file, "buffer"):
+        # Seeking flushes pending writes and drops the text layer's read-ahead
+        file.seek(file.tell())
+        return file.buffer
+    return file
+
+
+async def _read_chunks(file, buffer_size):
+    # Reads happen in the default executor, so that a slow disk does not stall
+    # the event loop
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, file.read, buffer_size)
+        if not chunk:
+            return
+        if isinstance(chunk, str):
+            chunk = chunk.encode(getattr(file, "encoding", None) or "utf-8")
+        yield chunk
+
+
+def _remaining_size(file):
+    # In-memory text may be re-encoded on the way, so its size is not known
+    if isinstance(file, io.TextIOBase):
+        return None
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
@@ -22,7 +22,11 @@ def main():
             for func_name, func in inspect.getmembers(theclass, inspect.isfunction):
                 # Only add function if it is part of this class.
                 # Get function's class name from qualified name.
-                if func.__qualname__.split(".")[0] == class_name:
+                # Skip generated functions, e.g. those of namedtuples.
+                if (
+                    func.__qualname__.split(".")[0] == class_name
+                    and func.__code__.co_filename == module.__file__
+                ):
                     functions.append((func_name, inspect.getsourcelines(func)[1]))
 
             error_count += check_alphabetical(
@@ -0,0 +1,120 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+from canvasaio.enrollment import Enrollment  # noqa
+from canvasaio.requester import Requester  # noqa
+from canvasaio.submission import Submission  # noqa
+
+# Number of objects built per measurement
+COUNT = 10000
+
+# Representative payloads, as returned by Canvas
+PAYLOADS = {
+    Submission: {
+        "id": 1,
+        "assignment_id": 1,
+        "user_id": 1,
+        "course_id": 1,
+        "attempt": 1,
+        "body": None,
+        "grade": "A",
+        "score": 95.0,
+        "entered_grade": "A",
+        "entered_score": 95.0,
+        "grade_matches_current_submission": True,
+        "graded_at": "2020-01-02T00:00:00Z",
+        "grader_id": 2,
+        "grading_period_id": None,
+        "html_url": "https://example.com/courses/1/assignments/1/submissions/1",
+        "preview_url": "https://example.com/courses/1/assignments/1/submissions/1?preview=1",
+        "submission_type": "online_upload",
+        "submitted_at": "2020-01-01T00:00:00Z",
+        "cached_due_date": "2020-01-01T12:00:00Z",
+        "url": None,
+        "late": False,
+        "missing": False,
+        "excused": False,
+        "late_policy_status": None,
+        "points_deducted": None,
+        "seconds_late": 0,
+        "extra_attempts": None,
+        "workflow_state": "graded",
+        "anonymous_id": "abcde",
+        "posted_at": "2020-01-03T00:00:00Z",
+        "redo_request": False,
+        "assignment_visible": True,
+        "read_status": "read",
+    },
+    Enrollment: {
+        "id": 1,
+        "user_id": 1,
+        "course_id": 1,
+        "type": "StudentEnrollment",
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2020-01-01T00:00:00Z",
+        "associated_user_id": None,
+        "start_at": None,
+        "end_at": None,
+        "course_section_id": 1,
+        "root_account_id": 1,
+        "limit_privileges_to_course_section": False,
+        "enrollment_state": "active",
+        "role": "StudentEnrollment",
+        "role_id": 3,
+        "last_activity_at": "2020-02-01T00:00:00Z",
+        "last_attended_at": None,
+        "total_activity_time": 3600,
+        "sis_account_id": None,
+        "sis_course_id": "COURSE-001",
+        "course_integration_id": None,
+        "sis_section_id": None,
+        "section_integration_id": None,
+        "sis_user_id": "12345",
+        "html_url": "https://example.com/courses/1/users/1",
+        "grades": {"current_score": 95.0, "final_score": 95.0},
+        "unposted_current_score": 95.0,
+        "unposted_final_score": 95.0,
+        "unposted_current_grade": "A",
+        "unposted_final_grade": "A",
+        "override_grade": None,
+        "override_score": None,
+    },
+}
+
+
+def measure(cls, requester):
+    """
+    Measure the memory used by one object built from a representative payload.
+
+    :returns: The number of bytes per object, excluding the payload itself.
+    :rtype: float
+    """
+    payloads = [dict(PAYLOADS[cls]) for _ in range(COUNT)]
+    tracemalloc.start()
+    objects = [cls(requester, payload) for payload in payloads]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / COUNT
+
+
+def main():
+    regular = Requester("https://example.com", "token")
+    compact = Requester("https://example.com", "token", compact_objects=True)
+
+    print("{:<12} {:>10} {:>10} {:>8}".format("Type", "Regular", "Compact", "Saved"))
+    for cls in PAYLOADS:
+        before = measure(cls, regular)
+        after = measure(cls, compact)
+        print(
+            "{:<12} {:>10.0f} {:>10.0f} {:>7.0%}".format(
+                cls.__name__, before, after, 1 - after / before
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
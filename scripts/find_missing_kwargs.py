@@ -9,10 +9,42 @@ import canvasaio  # noqa
 
 # Qualfied names of functions that are exempt from requiring kwargs
 WHITELIST = (
+    "BaseCache.clear",
+    "BaseCache.get",
+    "BaseCache.invalidate",
+    "BaseCache.set",
+    "CachedResponse.close",
+    "CachedResponse.read",
+    "CachedResponse.release",
+    "CachedResponse.text",
     "Canvas.get_current_user",
     "CanvasObject.set_attributes",
     "File.download",
     "File.get_contents",
+    "File.stream",
+    "MemoryCache.clear",
+    "MemoryCache.get",
+    "MemoryCache.invalidate",
+    "MemoryCache.set",
+    "PaginatedList.batches",
+    "PaginatedList.checkpoint",
+    "PaginatedList.count",
+    "PaginatedList.estimate_size",
+    "PaginatedList.pages",
+    "PaginatedList.resume",
+    "PaginatedList.stream",
+    "ProgressWaiter.add",
+    "ProgressWaiter.close",
+    "ProgressWaiter.wait",
+    "RateLimiter.acquire",
+    "RateLimiter.release",
+    "RateLimiter.throttled",
+    "RateLimiter.update",
+    "SQLiteCache.clear",
+    "SQLiteCache.close",
+    "SQLiteCache.get",
+    "SQLiteCache.invalidate",
+    "SQLiteCache.set",
     "Uploader.request_upload_token",
     "Uploader.start",
     "Uploader.upload",
@@ -28,6 +60,10 @@ def find_missing_kwargs():
             if inspect.getmodule(theclass).__name__ != module.__name__:
                 continue
 
+            # ignore "private" classes
+            if class_name.startswith("_"):
+                continue
+
             for func_name, func in inspect.getmembers(theclass, inspect.isfunction):
                 # Only process function if it is part of this class.
                 # Get function's class name from qualified name.
@@ -42,6 +42,17 @@ class TestAssignment(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(assignment.overrides), 1)
         self.assertIsInstance(assignment.overrides[0], AssignmentOverride)
 
+    async def test__init__overrides_lazy(self, m):
+        register_uris({"assignment": ["get_assignment_with_overrides"]}, m)
+        self.canvas._Canvas__requester.lazy_objects = True
+
+        assignment = await self.course.get_assignment(1)
+
+        self.assertNotIn("overrides", assignment.__dict__)
+        self.assertEqual(len(assignment.overrides), 1)
+        self.assertIsInstance(assignment.overrides[0], AssignmentOverride)
+        self.assertIs(assignment.overrides, assignment.overrides)
+
     # create_override()
     async def test_create_override(self, m):
         register_uris({"assignment": ["create_override"]}, m)
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+from canvasaio.cache import (
+    CachedResponse,
+    CacheEntry,
+    MemoryCache,
+    SQLiteCache,
+    entry_size,
+    validator_headers,
+)
+
+
+def make_entry(path="/api/v1/courses/1", body=b'{"id": 1}', **headers):
+    headers = [("ETag", '"abc"')] + list(headers.items())
+    return CacheEntry("https://example.com" + path, path, headers, body)
+
+
+class TestCacheHelpers(unittest.TestCase):
+    def test_validator_headers(self):
+        entry = make_entry(**{"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(
+            validator_headers(entry),
+            {
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+        )
+
+    def test_entry_size(self):
+        self.assertEqual(entry_size(make_entry(body=b"1234")), 4 + 4 + 5)
+
+
+class TestCachedResponse(unittest.IsolatedAsyncioTestCase):
+    async def test_body(self):
+        response = CachedResponse(make_entry())
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.read(), b'{"id": 1}')
+        self.assertEqual(await response.text(), '{"id": 1}')
+        self.assertEqual(await response.json(), {"id": 1})
+        self.assertEqual(response.content_length, 9)
+
+    def test_links(self):
+        link = (
+            '<https://example.com/api/v1/courses?page=2>; rel="next", '
+            '<https://example.com/api/v1/courses?page=9>; rel="last"'
+        )
+        response = CachedResponse(make_entry(Link=link))
+        self.assertEqual(
+            str(response.links["next"]["url"]),
+            "https://example.com/api/v1/courses?page=2",
+        )
+        self.assertEqual(
+            str(response.links["last"]["url"]),
+            "https://example.com/api/v1/courses?page=9",
+        )
+        self.assertIsNone(response.links.get("prev"))
+
+
+class TestMemoryCache(unittest.IsolatedAsyncioTestCase):
+    async def test_get_set(self):
+        cache = MemoryCache()
+        entry = make_entry()
+        await cache.set("key", entry)
+        self.assertEqual(await cache.get("key"), entry)
+        self.assertIsNone(await cache.get("other"))
+
+    async def test_evicts_least_recently_used(self):
+        entry = make_entry()
+        cache = MemoryCache(max_bytes=entry_size(entry) * 2)
+        await cache.set("a", entry)
+        await cache.set("b", entry)
+        await cache.get("a")
+        await cache.set("c", entry)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(await cache.get("b"))
+        self.assertIsNotNone(await cache.get("a"))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    async def test_oversized_entry_not_stored(self):
+        cache = MemoryCache(max_bytes=10)
+        await cache.set("a", make_entry())
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    async def test_invalidate(self):
+        cache = MemoryCache()
+        await cache.set("a", make_entry("/api/v1/courses/1"))
+        await cache.set("b", make_entry("/api/v1/courses/2"))
+        await cache.invalidate("/api/v1/courses/1")
+
+        self.assertIsNone(await cache.get("a"))
+        self.assertIsNotNone(await cache.get("b"))
+
+    async def test_clear(self):
+        cache = MemoryCache()
+        await cache.set("a", make_entry())
+        await cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+
+class TestSQLiteCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        self.cache = SQLiteCache(self.filename)
+
+    def tearDown(self):
+        self.cache.close()
+        os.remove(self.filename)
+
+    async def test_get_set(self):
+        entry = make_entry()
+        await self.cache.set("key", entry)
+        self.assertEqual(await self.cache.get("key"), entry)
+        self.assertIsNone(await self.cache.get("other"))
+
+    async def test_persistent(self):
+        entry = make_entry()
+        await self.cache.set("key", entry)
+        self.cache.close()
+
+        self.cache = SQLiteCache(self.filename)
+        self.assertEqual(await self.cache.get("key"), entry)
+
+    async def test_invalidate(self):
+        await self.cache.set("a", make_entry("/api/v1/courses/1"))
+        await self.cache.set("b", make_entry("/api/v1/courses/2"))
+        await self.cache.invalidate("/api/v1/courses/1")
+
+        self.assertIsNone(await self.cache.get("a"))
+        self.assertIsNotNone(await self.cache.get("b"))
+
+    async def test_clear(self):
+        await self.cache.set("a", make_entry())
+        await self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
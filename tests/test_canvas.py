@@ -196,6 +196,23 @@ class TestCanvas(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(user_by_obj, User)
         self.assertTrue(hasattr(user_by_obj, "name"))
 
+    async def test_get_user_compact(self, m):
+        register_uris({"user": ["get_by_id"]}, m)
+        self.canvas._Canvas__requester.compact_objects = True
+
+        # Users have no slotted variant, so they are built as usual
+        user = await self.canvas.get_user(1)
+        self.assertIs(type(user), User)
+        self.assertEqual(user.name, "John Doe")
+
+    async def test_get_user_identity_map(self, m):
+        register_uris({"user": ["get_by_id"]}, m)
+        canvas = Canvas(settings.BASE_URL, settings.API_KEY, identity_map=True)
+
+        user = await canvas.get_user(1)
+        self.assertIs(await canvas.get_user(1), user)
+        await canvas.close()
+
     async def test_get_user_by_id_type(self, m):
         register_uris({"user": ["get_by_id_type"]}, m)
 
@@ -1,5 +1,210 @@
+import gc
 import unittest
+from datetime import datetime
+
+import pytz
+
+from canvasaio.canvas_object import CanvasObject, compact_class, parse_date
+from canvasaio.collaboration import Collaborator
+from canvasaio.course_epub_export import CourseEpubExport
+from canvasaio.gradebook_history import Grader, SubmissionVersion
+from canvasaio.requester import Requester
+from canvasaio.submission import CompactSubmission, GroupedSubmission, Submission
+from canvasaio.tab import Tab
+from canvasaio.user import User, UserDisplay
+from tests import settings
 
 
 class TestCanvasObject(unittest.TestCase):
-    pass
+    def setUp(self):
+        self.canvas_object = CanvasObject(
+            None,
+            {
+                "name": "New course name",
+                "start_at": "2012-05-05T00:00:00Z",
+                "end_at": "2012-08-05T23:59:59Z",
+                "start_date": "2019-06-10T06:00:00Z",
+                "term": {"start_at": "2012-05-05T00:00:00Z"},
+                "count": 2012,
+            },
+        )
+
+    # set_attributes()
+    def test_set_attributes_date(self):
+        self.assertNotIn("start_at_date", self.canvas_object.__dict__)
+
+        start_at_date = self.canvas_object.start_at_date
+        self.assertEqual(start_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc))
+        self.assertEqual(start_at_date.tzinfo, pytz.utc)
+        self.assertIs(self.canvas_object.start_at_date, start_at_date)
+        self.assertEqual(
+            self.canvas_object.end_at_date,
+            datetime(2012, 8, 5, 23, 59, 59, tzinfo=pytz.utc),
+        )
+
+    def test_set_attributes_date_not_in_vars(self):
+        # Documented behaviour: dates only show up once they have been read
+        self.assertNotIn("start_at_date", vars(self.canvas_object))
+        self.assertNotIn("start_at_date", dir(self.canvas_object))
+
+        self.canvas_object.start_at_date
+        self.assertIn("start_at_date", vars(self.canvas_object))
+        self.assertNotIn("end_at_date", vars(self.canvas_object))
+
+    def test_set_attributes_date_field_kept(self):
+        self.assertEqual(self.canvas_object.start_date, "2019-06-10T06:00:00Z")
+        self.assertEqual(
+            self.canvas_object.start_date_date,
+            datetime(2019, 6, 10, 6, tzinfo=pytz.utc),
+        )
+
+    def test_set_attributes_not_date(self):
+        self.assertFalse(hasattr(self.canvas_object, "name_date"))
+        self.assertFalse(hasattr(self.canvas_object, "term_date"))
+        self.assertFalse(hasattr(self.canvas_object, "count_date"))
+        self.assertFalse(hasattr(self.canvas_object, "missing_date"))
+        with self.assertRaises(AttributeError):
+            self.canvas_object.missing
+
+    def test_set_attributes_updates_date(self):
+        self.assertEqual(self.canvas_object.start_at_date.year, 2012)
+
+        self.canvas_object.set_attributes({"start_at": "2020-01-01T00:00:00Z"})
+        self.assertEqual(self.canvas_object.start_at_date.year, 2020)
+
+    # compact objects
+    def test_compact(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, compact_objects=True)
+        submission = Submission(
+            requester,
+            {"id": 1, "user_id": 2, "submitted_at": "2012-05-05T00:00:00Z"},
+        )
+
+        self.assertIs(type(submission), CompactSubmission)
+        self.assertIsInstance(submission, Submission)
+        self.assertEqual(submission.user_id, 2)
+        self.assertIsNone(submission._extra)
+        self.assertEqual(
+            submission.submitted_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc)
+        )
+        self.assertFalse(hasattr(submission, "grade"))
+        self.assertFalse(hasattr(submission, "missing_date"))
+
+    def test_compact_extra_fields(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, compact_objects=True)
+        submission = Submission(requester, {"id": 1, "custom": "value"})
+
+        self.assertEqual(submission.custom, "value")
+        self.assertEqual(submission._extra, {"custom": "value"})
+        submission.set_attributes({"id": 2, "custom": "other"})
+        self.assertEqual((submission.id, submission.custom), (2, "other"))
+
+        del submission.custom
+        del submission.id
+        self.assertFalse(hasattr(submission, "custom"))
+        self.assertFalse(hasattr(submission, "id"))
+        with self.assertRaises(AttributeError):
+            del submission.custom
+
+    def test_compact_disabled(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY)
+        self.assertIs(type(Submission(requester, {"id": 1})), Submission)
+
+    def test_compact_class_invalid(self):
+        with self.assertRaises(TypeError):
+            compact_class(GroupedSubmission, ("user_id",))
+        with self.assertRaises(ValueError):
+            compact_class(Submission, ("id", "edit"))
+
+    # identity map
+    def test_identity_map(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, identity_map=True)
+        user = User(
+            requester, {"id": 1, "name": "John Doe", "email": "jdoe@example.com"}
+        )
+        again = User(requester, {"id": 1, "name": "John Q. Doe"})
+
+        self.assertIs(again, user)
+        self.assertEqual(user.name, "John Q. Doe")
+        self.assertEqual(user.email, "jdoe@example.com")
+        self.assertIsNot(User(requester, {"id": 2}), user)
+        self.assertIsNot(UserDisplay(requester, {"id": 1}), user)
+        self.assertIsNot(Tab(requester, {"id": "home"}), Tab(requester, {"id": "home"}))
+
+    def test_identity_map_not_interned(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, identity_map=True)
+        first = SubmissionVersion(requester, {"id": 5, "version": 1})
+        second = SubmissionVersion(requester, {"id": 5, "version": 2})
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.version, 1)
+        for cls in (Collaborator, CourseEpubExport, Grader):
+            self.assertIsNot(cls(requester, {"id": 5}), cls(requester, {"id": 5}))
+
+    def test_identity_map_weak(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, identity_map=True)
+        User(requester, {"id": 1, "name": "John Doe"})
+        gc.collect()
+
+        self.assertEqual(len(requester.identity_map), 0)
+        self.assertFalse(hasattr(User(requester, {"id": 1}), "name"))
+
+    def test_identity_map_disabled(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY)
+
+        self.assertIsNone(requester.identity_map)
+        self.assertIsNot(User(requester, {"id": 1}), User(requester, {"id": 1}))
+
+    def test_identity_map_lazy(self):
+        requester = Requester(
+            settings.BASE_URL, settings.API_KEY, identity_map=True, lazy_objects=True
+        )
+        user = User(
+            requester, {"id": 1, "name": "John Doe", "email": "jdoe@example.com"}
+        )
+        user.name = "Local"
+        User(requester, {"id": 1, "name": "John Q. Doe"})
+
+        self.assertEqual(user.name, "John Q. Doe")
+        self.assertEqual(user.email, "jdoe@example.com")
+
+    def test_identity_map_compact(self):
+        requester = Requester(
+            settings.BASE_URL, settings.API_KEY, identity_map=True, compact_objects=True
+        )
+        submission = Submission(requester, {"id": 1, "custom": "value"})
+        again = Submission(requester, {"id": 1, "score": 10})
+
+        self.assertIs(again, submission)
+        self.assertIsInstance(submission, CompactSubmission)
+        self.assertEqual((submission.custom, submission.score), ("value", 10))
+
+    # lazy objects
+    def test_lazy(self):
+        requester = Requester(settings.BASE_URL, settings.API_KEY, lazy_objects=True)
+        attributes = {"id": 1, "name": "Course", "start_at": "2012-05-05T00:00:00Z"}
+        canvas_object = CanvasObject(requester, attributes)
+
+        self.assertNotIn("name", canvas_object.__dict__)
+        self.assertEqual(canvas_object.name, "Course")
+        self.assertEqual(
+            canvas_object.start_at_date, datetime(2012, 5, 5, tzinfo=pytz.utc)
+        )
+        self.assertFalse(hasattr(canvas_object, "missing"))
+        self.assertIn("name=Course", repr(canvas_object))
+
+        canvas_object.name = "Renamed"
+        self.assertEqual(canvas_object.name, "Renamed")
+        canvas_object.set_attributes({"start_at": "2020-01-01T00:00:00Z"})
+        self.assertEqual(canvas_object.start_at_date.year, 2020)
+
+        del canvas_object.name
+        self.assertFalse(hasattr(canvas_object, "name"))
+        self.assertEqual(attributes["name"], "Course")
+
+    # parse_date()
+    def test_parse_date(self):
+        self.assertEqual(
+            parse_date("2012-05-05T10:11:12Z"),
+            datetime(2012, 5, 5, 10, 11, 12, tzinfo=pytz.utc),
+        )
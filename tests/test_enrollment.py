@@ -3,7 +3,7 @@ import unittest
 from aioresponses import aioresponses
 
 from canvasaio.canvas import Canvas
-from canvasaio.enrollment import Enrollment
+from canvasaio.enrollment import CompactEnrollment, Enrollment
 from tests import settings
 from tests.util import register_uris, aioresponse_mock
 
@@ -23,6 +23,15 @@ class TestEnrollment(unittest.IsolatedAsyncioTestCase):
     async def asyncTearDown(self):
         await self.canvas.close()
 
+    async def test_compact(self, m):
+        register_uris({"enrollment": ["get_by_id"]}, m)
+        self.canvas._Canvas__requester.compact_objects = True
+
+        enrollment = await self.account.get_enrollment(1)
+
+        self.assertIsInstance(enrollment, CompactEnrollment)
+        self.assertEqual(str(enrollment), str(self.enrollment))
+
     # __str__()
     def test__str__(self, m):
         string = str(self.enrollment)
@@ -1,10 +1,17 @@
+import hashlib
+import io
+import os
+import re
+import threading
 import unittest
 from os.path import isfile
+from unittest import mock
 
-from aioresponses import aioresponses
+from aioresponses import aioresponses, CallbackResult
 
 from canvasaio import Canvas
-from canvasaio.file import File
+from canvasaio.exceptions import CanvasException
+from canvasaio.file import File, _hash_file
 from tests import settings
 from tests.util import cleanup_file
 from tests.util import register_uris, aioresponse_mock
@@ -52,8 +59,275 @@ class TestFile(unittest.IsolatedAsyncioTestCase):
         finally:
             cleanup_file("canvasaio_file_download_test.txt")
 
+    async def test_download_file_object(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        buffer = io.BytesIO()
+
+        result = await self.file.download(buffer, chunk_size=4)
+
+        self.assertIsNone(result)
+        self.assertEqual(buffer.getvalue(), b'"file contents are here"')
+        self.assertFalse(buffer.closed)
+
+    async def test_download_debug_logging(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        buffer = io.BytesIO()
+
+        # The body is streamed to the file, not read for logging
+        with self.assertLogs("canvasaio.requester", level="DEBUG") as logs:
+            await self.file.download(buffer)
+
+        self.assertEqual(buffer.getvalue(), b'"file contents are here"')
+        self.assertFalse(any("file contents" in line for line in logs.output))
+
+    async def test_download_async_writer(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        chunks = []
+
+        class Writer(object):
+            async def write(self, data):
+                chunks.append(data)
+
+        await self.file.download(Writer(), chunk_size=4)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 4 for chunk in chunks))
+        self.assertEqual(b"".join(chunks), b'"file contents are here"')
+
+    async def test_download_checksum(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        try:
+            digest = await self.file.download(
+                "canvasaio_file_download_test.txt", checksum="sha256"
+            )
+            self.assertEqual(
+                digest, hashlib.sha256(b'"file contents are here"').hexdigest()
+            )
+        finally:
+            cleanup_file("canvasaio_file_download_test.txt")
+
+    @unittest.skipUnless(os.name == "posix", "POSIX permissions")
+    async def test_download_atomic_permissions(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        umask = os.umask(0o022)
+        try:
+            await self.file.download("canvasaio_file_download_test.txt")
+
+            # Same permissions as a file written directly, not owner-only
+            mode = os.stat("canvasaio_file_download_test.txt").st_mode
+            self.assertEqual(mode & 0o777, 0o644)
+        finally:
+            os.umask(umask)
+            cleanup_file("canvasaio_file_download_test.txt")
+
+    async def test_download_not_atomic(self, m):
+        register_uris({"file": ["file_download"]}, m)
+        try:
+            await self.file.download("canvasaio_file_download_test.txt", atomic=False)
+            with open("canvasaio_file_download_test.txt") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), '"file contents are here"')
+        finally:
+            cleanup_file("canvasaio_file_download_test.txt")
+
+    async def test_download_interrupted(self, m):
+        m.get(re.compile(".*"), exception=ConnectionResetError())
+        with open("canvasaio_file_download_test.txt", "w") as existing_file:
+            existing_file.write("previous version")
+        try:
+            with self.assertRaises(ConnectionResetError):
+                await self.file.download("canvasaio_file_download_test.txt")
+
+            # The previous file is left alone, and no partial file remains
+            with open("canvasaio_file_download_test.txt") as existing_file:
+                self.assertEqual(existing_file.read(), "previous version")
+            self.assertFalse(
+                [name for name in os.listdir(".") if name.endswith(".part")]
+            )
+        finally:
+            cleanup_file("canvasaio_file_download_test.txt")
+
+    def serve_ranges(self, m, data, ranges=True, fail=(), etag="v1"):
+        """
+        Answer requests for the file with slices of `data`, recording the
+        requested ranges.
+        """
+        requested = []
+
+        def callback(url, headers=None, **kwargs):
+            match = re.match(r"bytes=(\d+)-(\d+)$", (headers or {}).get("Range", ""))
+            if not ranges or match is None:
+                requested.append(None)
+                return CallbackResult(status=200, body=data)
+            start, end = int(match.group(1)), int(match.group(2))
+            requested.append((start, end))
+            if start in fail:
+                return CallbackResult(status=500, body=b"")
+            end = min(end, len(data) - 1)
+            body = data[start:][: end + 1 - start]
+            return CallbackResult(
+                status=206,
+                body=body,
+                headers={
+                    "Content-Range": "bytes {}-{}/{}".format(start, end, len(data)),
+                    "ETag": etag,
+                },
+            )
+
+        m.get(re.compile(".*"), callback=callback, repeat=True)
+        return requested
+
+    def cleanup_ranges(self, name):
+        for suffix in ("", ".part", ".part.json"):
+            cleanup_file(name + suffix)
+
+    async def test_download_ranges(self, m):
+        data = bytes(range(256)) * 40
+        requested = self.serve_ranges(m, data)
+        try:
+            digest = await self.file.download(
+                "canvasaio_file_download_test.bin",
+                checksum="md5",
+                concurrency=4,
+                range_size=1000,
+                chunk_size=300,
+            )
+
+            with open("canvasaio_file_download_test.bin", "rb") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+            self.assertEqual(digest, hashlib.md5(data).hexdigest())
+            self.assertEqual(
+                sorted(start for start, end in requested),
+                list(range(0, len(data), 1000)),
+            )
+            self.assertFalse(isfile("canvasaio_file_download_test.bin.part"))
+            self.assertFalse(isfile("canvasaio_file_download_test.bin.part.json"))
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
+    async def test_download_ranges_checksum_off_loop(self, m):
+        self.serve_ranges(m, bytes(range(256)) * 40)
+        threads = []
+
+        def hash_file(*args):
+            threads.append(threading.current_thread())
+            return _hash_file(*args)
+
+        try:
+            with mock.patch("canvasaio.file._hash_file", hash_file):
+                await self.file.download(
+                    "canvasaio_file_download_test.bin",
+                    checksum="md5",
+                    concurrency=2,
+                    range_size=1000,
+                )
+
+            self.assertEqual(len(threads), 1)
+            self.assertIsNot(threads[0], threading.main_thread())
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
+    async def test_download_ranges_not_supported(self, m):
+        data = bytes(range(256)) * 40
+        requested = self.serve_ranges(m, data, ranges=False)
+        try:
+            digest = await self.file.download(
+                "canvasaio_file_download_test.bin",
+                checksum="md5",
+                concurrency=4,
+                range_size=1000,
+            )
+
+            with open("canvasaio_file_download_test.bin", "rb") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+            self.assertEqual(digest, hashlib.md5(data).hexdigest())
+            self.assertEqual(requested, [None])
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
+    async def test_download_ranges_not_supported_stale_state(self, m):
+        data = bytes(range(256)) * 40
+        with open("canvasaio_file_download_test.bin.part.json", "w") as state_file:
+            state_file.write('{"size": 10240, "range_size": 1000, "done": [0]}')
+        requested = self.serve_ranges(m, data, ranges=False)
+        try:
+            await self.file.download(
+                "canvasaio_file_download_test.bin", concurrency=4, range_size=1000
+            )
+
+            with open("canvasaio_file_download_test.bin", "rb") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+            self.assertEqual(requested, [None])
+            self.assertFalse(isfile("canvasaio_file_download_test.bin.part.json"))
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
+    async def test_download_ranges_resume(self, m):
+        data = bytes(range(256)) * 40
+        requested = self.serve_ranges(m, data, fail=(3000,))
+        try:
+            with self.assertRaises(CanvasException):
+                await self.file.download(
+                    "canvasaio_file_download_test.bin", concurrency=2, range_size=1000
+                )
+            self.assertFalse(isfile("canvasaio_file_download_test.bin"))
+            self.assertTrue(isfile("canvasaio_file_download_test.bin.part"))
+
+            m.clear()
+            requested = self.serve_ranges(m, data)
+            await self.file.download(
+                "canvasaio_file_download_test.bin", concurrency=2, range_size=1000
+            )
+
+            with open("canvasaio_file_download_test.bin", "rb") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+            # A single byte probe, the failed range, and whatever the first run
+            # missed, but not the first range again
+            self.assertEqual(requested[0], (0, 0))
+            self.assertIn((3000, 3999), requested)
+            self.assertNotIn((0, 999), requested)
+            self.assertLess(len(requested), 11)
+            self.assertFalse(isfile("canvasaio_file_download_test.bin.part.json"))
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
+    async def test_download_ranges_changed(self, m):
+        data = bytes(range(256)) * 40
+        self.serve_ranges(m, data, fail=(3000,))
+        try:
+            with self.assertRaises(CanvasException):
+                await self.file.download(
+                    "canvasaio_file_download_test.bin", concurrency=2, range_size=1000
+                )
+
+            # The file changed since, so nothing from the first run is reused
+            m.clear()
+            data = bytes(reversed(data))
+            requested = self.serve_ranges(m, data, etag="v2")
+            await self.file.download(
+                "canvasaio_file_download_test.bin", concurrency=2, range_size=1000
+            )
+
+            with open("canvasaio_file_download_test.bin", "rb") as downloaded_file:
+                self.assertEqual(downloaded_file.read(), data)
+            self.assertEqual(requested[0], (0, 0))
+            self.assertEqual(
+                sorted(start for start, end in requested[1:]),
+                list(range(0, len(data), 1000)),
+            )
+        finally:
+            self.cleanup_ranges("canvasaio_file_download_test.bin")
+
     # contents()
     async def test_contents_file(self, m):
         register_uris({"file": ["file_contents"]}, m)
         contents = await self.file.get_contents()
         self.assertEqual(contents, '"Hello there"')
+
+    # stream()
+    async def test_stream(self, m):
+        register_uris({"file": ["file_download"]}, m)
+
+        chunks = [chunk async for chunk in self.file.stream(chunk_size=8)]
+
+        self.assertTrue(all(len(chunk) <= 8 for chunk in chunks))
+        self.assertEqual(b"".join(chunks), b'"file contents are here"')
@@ -0,0 +1,285 @@
+import json
+import os
+import tempfile
+import unittest
+
+from aioresponses import aioresponses
+
+from canvasaio import Canvas
+from canvasaio.exceptions import ResourceDoesNotExist
+from canvasaio.mirror import FileMirror, MANIFEST_NAME, MirrorResult
+from tests import settings
+from tests.util import register_uris, aioresponse_mock
+
+
+@aioresponse_mock
+class TestFileMirror(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.canvas = Canvas(settings.BASE_URL, settings.API_KEY)
+
+        with aioresponses() as m:
+            register_uris({"course": ["get_by_id"]}, m)
+            self.course = await self.canvas.get_course(1)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.mirror = FileMirror(self.course, self.directory.name)
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+        await self.canvas.close()
+
+    def read(self, path):
+        with open(os.path.join(self.directory.name, *path.split("/"))) as file:
+            return file.read()
+
+    def read_manifest(self):
+        with open(os.path.join(self.directory.name, MANIFEST_NAME)) as manifest:
+            return json.load(manifest)["files"]
+
+    async def mirror_initial(self, m):
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files",
+                    "list_week_files",
+                    "download_syllabus",
+                    "download_notes",
+                ]
+            },
+            m,
+        )
+        return await self.mirror.run()
+
+    def test__init__invalid_concurrency(self, m):
+        with self.assertRaises(ValueError):
+            FileMirror(self.course, self.directory.name, concurrency=0)
+
+    # run()
+    async def test_run(self, m):
+        result = await self.mirror_initial(m)
+
+        self.assertIsInstance(result, MirrorResult)
+        self.assertEqual(
+            sorted(result.downloaded), ["Syllabus.txt", "Week 1/Notes.txt"]
+        )
+        self.assertEqual(result.failed, [])
+        self.assertEqual(self.read("Syllabus.txt"), '"syllabus content"')
+        self.assertEqual(self.read("Week 1/Notes.txt"), '"notes content"')
+
+        manifest = self.read_manifest()
+        self.assertEqual(
+            manifest["11"],
+            {
+                "path": "Week 1/Notes.txt",
+                "folder_id": 2,
+                "size": 13,
+                "uuid": "bbbb",
+                "updated_at": "2012-07-06T14:58:50Z",
+            },
+        )
+        self.assertEqual(manifest["10"]["path"], "Syllabus.txt")
+        self.assertFalse(
+            os.path.exists(self.mirror._local_path(MANIFEST_NAME + ".tmp"))
+        )
+
+    async def test_run_corrupt_manifest(self, m):
+        # E.g. left behind by a run killed while writing it
+        with open(os.path.join(self.directory.name, MANIFEST_NAME), "w") as manifest:
+            manifest.write('{"version": 1, "files": {"10": {"pa')
+
+        with self.assertLogs("canvasaio.mirror", level="WARNING"):
+            result = await self.mirror_initial(m)
+
+        self.assertEqual(
+            sorted(result.downloaded), ["Syllabus.txt", "Week 1/Notes.txt"]
+        )
+        self.assertEqual(sorted(self.read_manifest()), ["10", "11"])
+
+    async def test_run_manifest_without_files(self, m):
+        with open(os.path.join(self.directory.name, MANIFEST_NAME), "w") as manifest:
+            manifest.write("[]")
+
+        with self.assertLogs("canvasaio.mirror", level="WARNING"):
+            result = await self.mirror_initial(m)
+
+        self.assertEqual(len(result.downloaded), 2)
+
+    async def test_run_unchanged(self, m):
+        await self.mirror_initial(m)
+
+        # Nothing is downloaded again: the download URLs are not mocked
+        register_uris(
+            {"mirror": ["list_folders", "list_root_files", "list_week_files"]}, m
+        )
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, [])
+        self.assertEqual(result.failed, [])
+        self.assertEqual(sorted(result.unchanged), ["Syllabus.txt", "Week 1/Notes.txt"])
+
+    async def test_run_changed_and_removed(self, m):
+        await self.mirror_initial(m)
+
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files_empty",
+                    "list_week_files_changed",
+                    "download_notes_changed",
+                ]
+            },
+            m,
+        )
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, ["Week 1/Notes.txt"])
+        self.assertEqual(result.removed, ["Syllabus.txt"])
+        self.assertEqual(self.read("Week 1/Notes.txt"), '"new notes content"')
+
+        # Removed files are only flagged by default
+        self.assertEqual(self.read("Syllabus.txt"), '"syllabus content"')
+        manifest = self.read_manifest()
+        self.assertTrue(manifest["10"]["removed"])
+        self.assertEqual(manifest["11"]["uuid"], "cccc")
+
+    async def test_run_delete(self, m):
+        await self.mirror_initial(m)
+
+        register_uris(
+            {"mirror": ["list_folders", "list_root_files_empty", "list_week_files"]},
+            m,
+        )
+        self.mirror.delete = True
+        result = await self.mirror.run()
+
+        self.assertEqual(result.removed, ["Syllabus.txt"])
+        self.assertFalse(os.path.exists(self.mirror._local_path("Syllabus.txt")))
+        self.assertNotIn("10", self.read_manifest())
+
+    async def test_run_moved(self, m):
+        await self.mirror_initial(m)
+
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files_empty",
+                    "list_week_files_moved",
+                ]
+            },
+            m,
+        )
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, [])
+        self.assertEqual(result.moved, ["Week 1/Syllabus (old).txt"])
+        self.assertEqual(result.removed, [])
+        self.assertEqual(self.read("Week 1/Syllabus (old).txt"), '"syllabus content"')
+        self.assertFalse(os.path.exists(self.mirror._local_path("Syllabus.txt")))
+
+    async def test_run_swapped(self, m):
+        await self.mirror_initial(m)
+
+        # The two files trade paths, and neither is downloaded again
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files_swapped",
+                    "list_week_files_swapped",
+                ]
+            },
+            m,
+        )
+        self.mirror.concurrency = 1
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, [])
+        self.assertEqual(sorted(result.moved), ["Syllabus.txt", "Week 1/Notes.txt"])
+        self.assertEqual(self.read("Syllabus.txt"), '"notes content"')
+        self.assertEqual(self.read("Week 1/Notes.txt"), '"syllabus content"')
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory.name, "Week 1"))),
+            ["Notes.txt"],
+        )
+
+        manifest = self.read_manifest()
+        self.assertEqual(manifest["10"]["path"], "Week 1/Notes.txt")
+        self.assertEqual(manifest["11"]["path"], "Syllabus.txt")
+
+    async def test_run_moved_onto_removed(self, m):
+        await self.mirror_initial(m)
+
+        # Notes.txt is deleted in Canvas and Syllabus.txt takes its place
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files_empty",
+                    "list_week_files_swapped",
+                ]
+            },
+            m,
+        )
+        self.mirror.delete = True
+        result = await self.mirror.run()
+
+        self.assertEqual(result.moved, ["Week 1/Notes.txt"])
+        self.assertEqual(result.removed, ["Week 1/Notes.txt"])
+        self.assertEqual(self.read("Week 1/Notes.txt"), '"syllabus content"')
+        self.assertEqual(list(self.read_manifest()), ["10"])
+
+    async def test_run_folder_error(self, m):
+        await self.mirror_initial(m)
+
+        register_uris(
+            {"mirror": ["list_folders", "list_root_files_error", "list_week_files"]},
+            m,
+        )
+        self.mirror.delete = True
+        result = await self.mirror.run()
+
+        # Files of a folder that could not be listed are not deleted
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(result.failed[0][0], "")
+        self.assertIsInstance(result.failed[0][1], ResourceDoesNotExist)
+        self.assertEqual(result.removed, [])
+        self.assertEqual(self.read("Syllabus.txt"), '"syllabus content"')
+        self.assertIn("10", self.read_manifest())
+
+    async def test_run_download_error(self, m):
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files",
+                    "list_week_files",
+                    "download_notes",
+                ]
+            },
+            m,
+        )
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, ["Week 1/Notes.txt"])
+        self.assertEqual([path for path, error in result.failed], ["Syllabus.txt"])
+        # The failed file is retried by the next run
+        self.assertNotIn("10", self.read_manifest())
+
+        register_uris(
+            {
+                "mirror": [
+                    "list_folders",
+                    "list_root_files",
+                    "list_week_files",
+                    "download_syllabus",
+                ]
+            },
+            m,
+        )
+        result = await self.mirror.run()
+
+        self.assertEqual(result.downloaded, ["Syllabus.txt"])
+        self.assertEqual(result.unchanged, ["Week 1/Notes.txt"])
@@ -1,10 +1,19 @@
+import asyncio
+import re
 import unittest
 
-from aioresponses import aioresponses
+from aioresponses import aioresponses, CallbackResult
 
 from canvasaio import Canvas
 from canvasaio.enrollment_term import EnrollmentTerm
-from canvasaio.paginated_list import PaginatedList
+from canvasaio.exceptions import ResourceDoesNotExist
+from canvasaio.paginated_list import (
+    Page,
+    PaginatedList,
+    merge,
+    _page_number,
+    _with_page_number,
+)
 from canvasaio.user import User
 from tests import settings
 from tests.util import register_uris, aioresponse_mock
@@ -60,6 +69,654 @@ class TestPaginatedList(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(item_list), 6)
         self.assertIsInstance(item_list[0], User)
 
+    # numbered pagination
+    async def test_paginated_list_numbered_concurrent(self, m):
+        requires = {"paginated_list": ["8_4_pages_p{}".format(n) for n in range(1, 5)]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages", _concurrency=3
+        )
+        item_list = [item async for item in pag_list]
+        self.assertEqual([item.id for item in item_list], [str(n) for n in range(1, 9)])
+
+    async def test_paginated_list_numbered_overlap(self, m):
+        in_flight = []
+        peak = []
+
+        def respond(n):
+            async def callback(url, **kwargs):
+                in_flight.append(n)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(n)
+                link = '<{}api/v1/numbered?page={}&per_page=1>; rel="{}"'
+                links = [link.format(settings.BASE_URL + "/", 3, "last")]
+                if n < 3:
+                    links.append(link.format(settings.BASE_URL + "/", n + 1, "next"))
+                return CallbackResult(
+                    payload=[{"id": n}], headers={"Link": ", ".join(links)}
+                )
+
+            return callback
+
+        url = re.escape(settings.BASE_URL_WITH_VERSION + "numbered")
+        m.get(re.compile(url + r"\?per_page=100$"), callback=respond(1))
+        for n in (2, 3):
+            m.get(
+                re.compile(url + r"\?page={}&per_page=1$".format(n)),
+                callback=respond(n),
+            )
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "numbered", _concurrency=4
+        )
+        item_list = [item async for item in pag_list]
+
+        self.assertEqual([item.id for item in item_list], [1, 2, 3])
+        self.assertEqual(max(peak), 2)
+
+    async def test_paginated_list_numbered_sequential_default(self, m):
+        requires = {"paginated_list": ["8_4_pages_p{}".format(n) for n in range(1, 5)]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        self.assertEqual(pag_list.concurrency, 1)
+        item_list = [item async for item in pag_list]
+        self.assertEqual(len(item_list), 8)
+
+    # prefetch
+    async def test_paginated_list_prefetch(self, m):
+        events = []
+
+        def respond(n):
+            async def callback(url, **kwargs):
+                events.append("fetch {}".format(n))
+                headers = {}
+                if n < 3:
+                    headers["Link"] = '<{}p?page={}>; rel="next"'.format(
+                        settings.BASE_URL_WITH_VERSION, n + 1
+                    )
+                return CallbackResult(payload=[{"id": n}], headers=headers)
+
+            return callback
+
+        url = re.escape(settings.BASE_URL_WITH_VERSION + "p")
+        m.get(re.compile(url + r"\?per_page=100$"), callback=respond(1))
+        for n in (2, 3):
+            m.get(re.compile(url + r"\?page={}$".format(n)), callback=respond(n))
+
+        pag_list = PaginatedList(User, self.requester, "GET", "p", _prefetch=1)
+        async for item in pag_list:
+            await asyncio.sleep(0.01)  # "process" the element
+            events.append("processed {}".format(item.id))
+
+        self.assertEqual(
+            events,
+            [
+                "fetch 1",
+                "fetch 2",
+                "processed 1",
+                "fetch 3",
+                "processed 2",
+                "processed 3",
+            ],
+        )
+
+    async def test_paginated_list_prefetch_error(self, m):
+        register_uris({"paginated_list": ["4_2_pages_p1"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "four_objects_two_pages", _prefetch=2
+        )
+        items = []
+        with self.assertRaises(Exception):
+            async for item in pag_list:
+                items.append(item)
+        self.assertEqual(len(items), 2)
+
+    async def test_paginated_list_prefetch_break(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "six_objects_three_pages", _prefetch=1
+        )
+        async for item in pag_list:
+            break
+        self.assertEqual(item.id, "1")
+
+        item_list = [item async for item in pag_list]
+        self.assertEqual(len(item_list), 6)
+
+    # stream()
+    async def test_stream(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        item_list = [item async for item in pag_list.stream()]
+
+        self.assertEqual([item.id for item in item_list], [str(n) for n in range(1, 7)])
+        self.assertEqual(pag_list._elements, [])
+        self.assertEqual(pag_list._next_url, "six_objects_three_pages")
+
+    async def test_stream_after_partial_fetch(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        await pag_list[0]
+        item_list = [item async for item in pag_list.stream()]
+
+        self.assertEqual([item.id for item in item_list], [str(n) for n in range(1, 7)])
+        self.assertEqual(len(pag_list._elements), 2)
+
+    async def test_stream_prefetch_numbered(self, m):
+        requires = {"paginated_list": ["8_4_pages_p{}".format(n) for n in range(1, 5)]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            "GET",
+            "eight_objects_four_pages",
+            _concurrency=2,
+            _prefetch=1,
+        )
+        item_list = [item async for item in pag_list.stream()]
+
+        self.assertEqual([item.id for item in item_list], [str(n) for n in range(1, 9)])
+        self.assertEqual(pag_list._elements, [])
+
+    async def test_stream_prefetch_error(self, m):
+        register_uris({"paginated_list": ["4_2_pages_p1"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "four_objects_two_pages", _prefetch=1
+        )
+        items = []
+        with self.assertRaises(Exception):
+            async for item in pag_list.stream():
+                items.append(item)
+        self.assertEqual(len(items), 2)
+
+    # merge()
+    async def test_merge(self, m):
+        requires = {
+            "paginated_list": [
+                "2_1_page",
+                "6_3_pages_p1",
+                "6_3_pages_p2",
+                "6_3_pages_p3",
+            ]
+        }
+        register_uris(requires, m)
+
+        two = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        six = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        results = [result async for result in merge([two, six], concurrency=2)]
+
+        self.assertEqual(len(results), 8)
+        for source, count in ((two, 2), (six, 6)):
+            ids = [r.element.id for r in results if r.source is source]
+            self.assertEqual(ids, [str(n) for n in range(1, count + 1)])
+        self.assertTrue(all(r.error is None for r in results))
+        self.assertEqual(six._elements, [])
+
+    async def test_merge_prefetch(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        six = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        results = [result async for result in merge([six], prefetch=2)]
+
+        self.assertEqual(len(results), 6)
+        # The lists merged keep their own setting
+        self.assertEqual(six.prefetch, 0)
+
+    async def test_merge_tagged_async_sources(self, m):
+        requires = {"paginated_list": ["2_1_page", "4_2_pages_p1", "4_2_pages_p2"]}
+        register_uris(requires, m)
+
+        async def sources():
+            yield "a", PaginatedList(
+                User, self.requester, "GET", "two_objects_one_page"
+            )
+            yield "b", PaginatedList(
+                User, self.requester, "GET", "four_objects_two_pages"
+            )
+
+        results = [result async for result in merge(sources(), concurrency=1)]
+
+        self.assertEqual([r.source for r in results], ["a"] * 2 + ["b"] * 4)
+
+    async def test_merge_isolates_errors(self, m):
+        register_uris({"paginated_list": ["2_1_page"]}, m)
+        m.get(re.compile(r".*/missing_list.*"), status=404, payload={})
+
+        missing = PaginatedList(User, self.requester, "GET", "missing_list")
+        two = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        results = [result async for result in merge([missing, two])]
+
+        errors = [r for r in results if r.error is not None]
+        self.assertEqual(len(errors), 1)
+        self.assertIs(errors[0].source, missing)
+        self.assertIsNone(errors[0].element)
+        self.assertIsInstance(errors[0].error, ResourceDoesNotExist)
+        self.assertEqual(len([r for r in results if r.source is two]), 2)
+
+    async def test_merge_raise_errors(self, m):
+        m.get(re.compile(r".*/missing_list.*"), status=404, payload={})
+
+        missing = PaginatedList(User, self.requester, "GET", "missing_list")
+        with self.assertRaises(ResourceDoesNotExist):
+            async for result in merge([missing], return_exceptions=False):
+                pass
+
+    async def test_merge_concurrency(self, m):
+        active = 0
+        peak = 0
+
+        async def callback(url, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return CallbackResult(payload=[{"id": "1"}])
+
+        m.get(re.compile(r".*/list_\d+.*"), callback=callback, repeat=True)
+        lists = [
+            PaginatedList(User, self.requester, "GET", "list_{}".format(n))
+            for n in range(6)
+        ]
+        results = [result async for result in merge(lists, concurrency=2)]
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(peak, 2)
+
+    async def test_merge_invalid_concurrency(self, m):
+        with self.assertRaises(ValueError):
+            async for result in merge([], concurrency=0):
+                pass
+
+    # checkpoints
+    async def test_checkpoint_resume(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        await pag_list[2]
+        token = pag_list.checkpoint()
+
+        resumed = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        self.assertIs(resumed.resume(token), resumed)
+        self.assertEqual(resumed.offset, 4)
+        self.assertEqual([item.id async for item in resumed], ["5", "6"])
+
+    async def test_checkpoint_before_fetching(self, m):
+        requires = {"paginated_list": ["4_2_pages_p1", "4_2_pages_p2"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "four_objects_two_pages")
+        token = pag_list.checkpoint()
+
+        resumed = PaginatedList(User, self.requester, "GET", "four_objects_two_pages")
+        resumed.resume(token)
+        self.assertEqual(resumed.offset, 0)
+        self.assertEqual(len([item async for item in resumed]), 4)
+
+    async def test_checkpoint_at_end(self, m):
+        register_uris({"paginated_list": ["2_1_page"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        await pag_list[0]
+
+        resumed = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        resumed.resume(pag_list.checkpoint())
+        self.assertEqual([item async for item in resumed], [])
+        self.assertEqual(resumed.offset, 2)
+
+    async def test_on_checkpoint_stream(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        tokens = []
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            "GET",
+            "six_objects_three_pages",
+            _on_checkpoint=tokens.append,
+            _checkpoint_every=2,
+        )
+        item_list = []
+        async for item in pag_list.stream():
+            item_list.append(item.id)
+            if item.id == "4":
+                # The checkpoint is only reported once the page is consumed
+                self.assertEqual(tokens, [])
+
+        self.assertEqual(len(item_list), 6)
+        # Every second page, and at the end of the collection
+        self.assertEqual(len(tokens), 2)
+
+        register_uris({"paginated_list": ["6_3_pages_p3"]}, m)
+        resumed = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        resumed.resume(tokens[0])
+        self.assertEqual(resumed.offset, 4)
+        self.assertEqual([item.id async for item in resumed.stream()], ["5", "6"])
+
+    async def test_on_checkpoint_coroutine_pages(self, m):
+        requires = {"paginated_list": ["4_2_pages_p1", "4_2_pages_p2"]}
+        register_uris(requires, m)
+
+        tokens = []
+
+        async def save(token):
+            tokens.append(token)
+
+        pag_list = PaginatedList(
+            User,
+            self.requester,
+            "GET",
+            "four_objects_two_pages",
+            _on_checkpoint=save,
+            _prefetch=1,
+        )
+        pages = [page async for page in pag_list.pages()]
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(len(tokens), 2)
+        register_uris({"paginated_list": ["4_2_pages_p2"]}, m)
+        resumed = PaginatedList(User, self.requester, "GET", "four_objects_two_pages")
+        resumed.resume(tokens[0])
+        self.assertEqual([item.id async for item in resumed], ["3", "4"])
+
+    async def test_resume_invalid(self, m):
+        register_uris({"paginated_list": ["2_1_page"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        other = PaginatedList(User, self.requester, "GET", "four_objects_two_pages")
+
+        with self.assertRaises(ValueError):
+            pag_list.resume("not a token")
+        with self.assertRaises(ValueError):
+            pag_list.resume(other.checkpoint())
+
+        token = pag_list.checkpoint()
+        await pag_list[0]
+        with self.assertRaises(ValueError):
+            pag_list.resume(token)
+
+    # random access by page number
+    async def test_getitem_numbered_direct(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1", "8_4_pages_p4"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        item = await pag_list[7]
+        self.assertEqual(item.id, "8")
+        self.assertEqual(len(pag_list._elements), 2)
+
+        with self.assertRaises(IndexError):
+            await pag_list[8]
+
+    async def test_getitem_future(self, m):
+        register_uris({"paginated_list": ["2_1_page"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        item = pag_list[1]
+        self.assertIsInstance(item, asyncio.Future)
+
+        done, pending = await asyncio.wait([item])
+        self.assertEqual(done, {item})
+        self.assertEqual(item.result().id, "2")
+
+    async def test_getitem_numbered_during_growth(self, m):
+        requested = []
+
+        def respond(n):
+            async def callback(url, **kwargs):
+                requested.append(n)
+                await asyncio.sleep(0.01)
+                link = '<{}api/v1/numbered?page={}&per_page=1>; rel="{}"'
+                links = [link.format(settings.BASE_URL + "/", 3, "last")]
+                if n < 3:
+                    links.append(link.format(settings.BASE_URL + "/", n + 1, "next"))
+                return CallbackResult(
+                    payload=[{"id": n}], headers={"Link": ", ".join(links)}
+                )
+
+            return callback
+
+        url = re.escape(settings.BASE_URL_WITH_VERSION + "numbered")
+        m.get(re.compile(url + r"\?per_page=100$"), callback=respond(1))
+        for n in (2, 3):
+            m.get(
+                re.compile(url + r"\?page={}&per_page=1$".format(n)),
+                callback=respond(n),
+                repeat=True,
+            )
+
+        pag_list = PaginatedList(User, self.requester, "GET", "numbered")
+        await pag_list[0]
+        # Page 2 is already being fetched sequentially when item 1 is requested
+        growing = asyncio.ensure_future(pag_list._get_up_to_index(2))
+        while requested != [1, 2]:
+            await asyncio.sleep(0)
+        item = await pag_list[1]
+        await growing
+
+        self.assertEqual(item.id, 2)
+        self.assertEqual(requested, [1, 2, 3])
+        self.assertEqual(pag_list._sparse_pages, {})
+
+    async def test_slice_numbered_direct(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1", "8_4_pages_p4"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        item_list = [item async for item in pag_list[6:20]]
+        self.assertEqual([item.id for item in item_list], ["7", "8"])
+
+    async def test_slice_numbered_step(self, m):
+        requires = {"paginated_list": ["8_4_pages_p1", "8_4_pages_p3", "8_4_pages_p4"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages", _concurrency=2
+        )
+        item_list = [item async for item in pag_list[1::3]]
+        self.assertEqual([item.id for item in item_list], ["2", "5", "8"])
+
+    async def test_slice_numbered_then_iterate(self, m):
+        requires = {"paginated_list": ["8_4_pages_p{}".format(n) for n in range(1, 5)]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        item_list = [item async for item in pag_list[4:6]]
+        self.assertEqual([item.id for item in item_list], ["5", "6"])
+
+        # Pages fetched directly are reused, not fetched again
+        item_list = [item async for item in pag_list]
+        self.assertEqual([item.id for item in item_list], [str(n) for n in range(1, 9)])
+        self.assertEqual(pag_list._sparse_pages, {})
+
+    async def test_slice_open_ended(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        item_list = [item async for item in pag_list[3:]]
+        self.assertEqual([item.id for item in item_list], ["4", "5", "6"])
+
+    # concurrent access
+    async def test_getitem_concurrent(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        items = await asyncio.gather(*(pag_list[i] for i in (5, 0, 3, 5, 1)))
+
+        self.assertEqual([item.id for item in items], ["6", "1", "4", "6", "2"])
+        self.assertEqual(
+            [item.id for item in pag_list._elements], [str(n) for n in range(1, 7)]
+        )
+
+    async def test_iterate_concurrent(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+
+        async def collect():
+            return [item.id async for item in pag_list]
+
+        results = await asyncio.gather(collect(), collect(), collect())
+        for result in results:
+            self.assertEqual(result, [str(n) for n in range(1, 7)])
+        self.assertEqual(len(pag_list._elements), 6)
+
+    async def test_getitem_numbered_concurrent(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1", "8_4_pages_p4"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        items = await asyncio.gather(*(pag_list[i] for i in (7, 6, 7, 0)))
+        self.assertEqual([item.id for item in items], ["8", "7", "8", "1"])
+
+    async def test_getitem_numbered_failure_retried(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1"]}, m)
+        m.get(
+            settings.BASE_URL_WITH_VERSION
+            + "eight_objects_four_pages?page=3&per_page=2",
+            status=500,
+        )
+        register_uris({"paginated_list": ["8_4_pages_p3"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        with self.assertRaises(Exception):
+            await pag_list[4]
+        self.assertEqual((await pag_list[4]).id, "5")
+
+    # estimate_size() / count()
+    async def test_estimate_size_numbered(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        self.assertEqual(await pag_list.estimate_size(), 8)
+
+    async def test_estimate_size_unknown(self, m):
+        register_uris({"paginated_list": ["6_3_pages_p1"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        self.assertIsNone(await pag_list.estimate_size())
+
+    async def test_estimate_size_single_page(self, m):
+        register_uris({"paginated_list": ["2_1_page"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "two_objects_one_page")
+        self.assertEqual(await pag_list.estimate_size(), 2)
+
+    async def test_count_numbered(self, m):
+        register_uris({"paginated_list": ["8_4_pages_p1", "8_4_pages_p4"]}, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages"
+        )
+        self.assertEqual(await pag_list.count(), 8)
+
+    async def test_count_scan(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        self.assertEqual(await pag_list.count(), 6)
+        self.assertEqual(len(pag_list._elements), 2)
+
+    async def test_count_empty(self, m):
+        register_uris({"paginated_list": ["empty"]}, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "empty_list")
+        self.assertEqual(await pag_list.count(), 0)
+
+    # pages()
+    async def test_pages(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        pages = [page async for page in pag_list.pages()]
+
+        self.assertEqual(len(pages), 3)
+        for page in pages:
+            self.assertIsInstance(page, Page)
+            self.assertEqual(len(page), 2)
+            self.assertIsInstance(page[0], User)
+        self.assertEqual(pages[0].next_url, "six_objects_three_pages?page=2&per_page=2")
+        self.assertEqual(
+            pages[0].links["next"],
+            settings.BASE_URL_WITH_VERSION
+            + "six_objects_three_pages?page=2&per_page=2",
+        )
+        self.assertEqual(pages[1].number, 2)
+        self.assertIn("six_objects_three_pages?page=2&per_page=2", pages[1].url)
+        self.assertIsNone(pages[2].next_url)
+        self.assertEqual(pag_list._elements, [])
+
+    async def test_pages_prefetch(self, m):
+        requires = {"paginated_list": ["8_4_pages_p{}".format(n) for n in range(1, 5)]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(
+            User, self.requester, "GET", "eight_objects_four_pages", _prefetch=2
+        )
+        pages = [page async for page in pag_list.pages()]
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 2])
+        self.assertEqual([page.number for page in pages], [None, 2, 3, 4])
+
+    # batches()
+    async def test_batches(self, m):
+        requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
+        register_uris(requires, m)
+
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        batches = [batch async for batch in pag_list.batches(4)]
+
+        self.assertEqual([len(batch) for batch in batches], [4, 2])
+        self.assertEqual(batches[1][0].id, "5")
+
+    async def test_batches_invalid_size(self, m):
+        pag_list = PaginatedList(User, self.requester, "GET", "six_objects_three_pages")
+        with self.assertRaises(ValueError):
+            async for batch in pag_list.batches(0):
+                pass
+
+    def test_page_number(self, m):
+        self.assertEqual(_page_number("users?page=12&per_page=10"), 12)
+        self.assertIsNone(_page_number("users?page=bookmark:WzEwXQ&per_page=10"))
+        self.assertIsNone(_page_number("users?per_page=10"))
+        self.assertIsNone(_page_number(None))
+
+    def test_with_page_number(self, m):
+        self.assertEqual(
+            _with_page_number("users?page=2&per_page=10&include[]=email", 7),
+            "users?page=7&per_page=10&include[]=email",
+        )
+
     # reusing iterator
     async def test_iterator(self, m):
         requires = {"paginated_list": ["6_3_pages_p1", "6_3_pages_p2", "6_3_pages_p3"]}
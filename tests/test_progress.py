@@ -1,9 +1,11 @@
+import asyncio
 import unittest
 
 from aioresponses import aioresponses
 
 from canvasaio.canvas import Canvas
-from canvasaio.progress import Progress
+from canvasaio.exceptions import ProgressFailed
+from canvasaio.progress import Progress, ProgressWaiter, _CompletionTracker
 from tests import settings
 from tests.util import register_uris, aioresponse_mock
 
@@ -39,3 +41,144 @@ class TestProgress(unittest.IsolatedAsyncioTestCase):
 
         response = await self.progress.query()
         self.assertIsInstance(response, Progress)
+
+    # wait()
+    async def test_wait(self, m):
+        register_uris({"progress": ["progress_running", "progress_completed"]}, m)
+
+        progress = await self.progress.wait(min_interval=0.01)
+        self.assertIs(progress, self.progress)
+        self.assertEqual(progress.workflow_state, "completed")
+        self.assertEqual(progress.completion, 100)
+
+    async def test_wait_completed(self, m):
+        progress = Progress(
+            self.canvas._Canvas__requester, {"id": 3, "workflow_state": "completed"}
+        )
+        self.assertIs(await progress.wait(), progress)
+
+    async def test_wait_failed(self, m):
+        register_uris({"progress": ["progress_failed"]}, m)
+
+        with self.assertRaises(ProgressFailed) as cm:
+            await self.progress.wait(min_interval=0.01)
+        self.assertIs(cm.exception.progress, self.progress)
+        self.assertEqual(str(cm.exception), "Failed to assign members")
+
+    async def test_wait_timeout(self, m):
+        register_uris({"progress": ["progress_running"]}, m)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.progress.wait(timeout=0.01, min_interval=0.05)
+        self.assertEqual(self.progress.completion, 50)
+
+
+class TestCompletionTracker(unittest.TestCase):
+    def setUp(self):
+        self.progress = Progress(None, {"id": 1, "completion": 0})
+        self.tracker = _CompletionTracker(self.progress, 1.0, 30.0, 0.0)
+
+    def test_update_velocity(self):
+        self.progress.completion = 50
+        self.tracker.update(10.0)
+        # 50 points left at 5 points per second: poll halfway to the end
+        self.assertEqual(self.tracker.interval, 5.0)
+
+        self.progress.completion = 98
+        self.tracker.update(20.0)
+        self.assertEqual(self.tracker.interval, 1.0)
+
+    def test_update_backoff(self):
+        intervals = []
+        for now in (1.0, 3.0, 7.0, 15.0, 31.0, 63.0):
+            self.tracker.update(now)
+            intervals.append(self.tracker.interval)
+        self.assertEqual(intervals, [2.0, 4.0, 8.0, 16.0, 30.0, 30.0])
+
+    def test_update_queued(self):
+        progress = Progress(None, {"id": 1, "completion": None})
+        tracker = _CompletionTracker(progress, 1.0, 30.0, 0.0)
+        tracker.update(1.0)
+        self.assertEqual(tracker.interval, 2.0)
+
+
+@aioresponse_mock
+class TestProgressWaiter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.canvas = Canvas(settings.BASE_URL, settings.API_KEY)
+        requester = self.canvas._Canvas__requester
+        self.progress_2 = Progress(
+            requester, {"id": 2, "completion": 0, "workflow_state": "queued"}
+        )
+        self.progress_3 = Progress(
+            requester, {"id": 3, "completion": 0, "workflow_state": "running"}
+        )
+        self.waiter = ProgressWaiter(min_interval=0.01)
+
+    async def asyncTearDown(self):
+        await self.waiter.close()
+        await self.canvas.close()
+
+    async def test_wait(self, m):
+        requires = {
+            "progress": ["progress_running", "progress_completed", "course_progress"]
+        }
+        register_uris(requires, m)
+
+        results = await self.waiter.wait([self.progress_2, self.progress_3])
+        self.assertEqual(results, [self.progress_2, self.progress_3])
+        self.assertEqual(self.progress_2.workflow_state, "completed")
+        self.assertEqual(self.progress_3.workflow_state, "completed")
+
+        # The polling loop ends once there is nothing left to wait for
+        await asyncio.wait_for(self.waiter._task, 1)
+
+    async def test_wait_restarts_loop(self, m):
+        register_uris({"progress": ["progress_completed", "course_progress"]}, m)
+
+        self.assertEqual(await self.waiter.wait([self.progress_2]), [self.progress_2])
+        first_task = self.waiter._task
+        await asyncio.wait_for(first_task, 1)
+
+        self.assertEqual(await self.waiter.wait([self.progress_3]), [self.progress_3])
+        self.assertIsNot(self.waiter._task, first_task)
+
+    async def test_wait_timeout_ends_loop(self, m):
+        register_uris({"progress": ["progress_running"]}, m)
+        waiter = ProgressWaiter(min_interval=10)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await waiter.wait([self.progress_2], timeout=0.01)
+        # Well before the job was due to be queried again
+        await asyncio.wait_for(waiter._task, 1)
+
+    async def test_wait_failed(self, m):
+        register_uris({"progress": ["progress_failed", "course_progress"]}, m)
+
+        results = await self.waiter.wait(
+            [self.progress_2, self.progress_3], return_exceptions=True
+        )
+        self.assertIsInstance(results[0], ProgressFailed)
+        self.assertIs(results[1], self.progress_3)
+
+    async def test_wait_timeout(self, m):
+        register_uris({"progress": ["progress_running"]}, m)
+        waiter = ProgressWaiter(min_interval=0.05)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await waiter.wait([self.progress_2], timeout=0.01)
+        await waiter.close()
+
+    async def test_add_finished(self, m):
+        completed = Progress(None, {"id": 4, "workflow_state": "completed"})
+        failed = Progress(None, {"id": 5, "workflow_state": "failed", "message": None})
+
+        self.assertIs(await self.waiter.add(completed), completed)
+        with self.assertRaises(ProgressFailed):
+            await self.waiter.add(failed)
+        self.assertIsNone(self.waiter._task)
+
+    async def test_close(self, m):
+        async with ProgressWaiter(min_interval=10) as waiter:
+            future = waiter.add(self.progress_2)
+        self.assertTrue(future.cancelled())
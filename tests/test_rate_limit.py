@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+
+from canvasaio.rate_limit import RateLimiter, parse_rate_limit_headers
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.limiter = RateLimiter(
+            initial_window=4, min_window=1, max_window=6, cooldown=0
+        )
+
+    # __init__()
+    def test_init_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(initial_window=10, max_window=5)
+
+    def test_init_invalid_decrease_factor(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(decrease_factor=1.5)
+
+    # update()
+    async def test_update_high_quota_grows_window(self):
+        await self.limiter.update({"X-Rate-Limit-Remaining": "650.0"})
+        self.assertEqual(self.limiter.window, 5)
+        self.assertEqual(self.limiter.remaining, 650.0)
+
+    async def test_update_grow_capped(self):
+        for _ in range(10):
+            await self.limiter.update({"X-Rate-Limit-Remaining": "650.0"})
+        self.assertEqual(self.limiter.window, 6)
+
+    async def test_update_medium_quota_holds_window(self):
+        await self.limiter.update({"X-Rate-Limit-Remaining": "300.0"})
+        self.assertEqual(self.limiter.window, 4)
+
+    async def test_update_low_quota_shrinks_window(self):
+        await self.limiter.update({"X-Rate-Limit-Remaining": "100.0"})
+        self.assertEqual(self.limiter.window, 2)
+        await self.limiter.update({"X-Rate-Limit-Remaining": "50.0"})
+        self.assertEqual(self.limiter.window, 1)
+        await self.limiter.update({"X-Rate-Limit-Remaining": "10.0"})
+        self.assertEqual(self.limiter.window, 1)
+
+    async def test_update_low_quota_cooldown(self):
+        limiter = RateLimiter(initial_window=8, cooldown=60)
+        await limiter.update({"X-Rate-Limit-Remaining": "100.0"})
+        await limiter.update({"X-Rate-Limit-Remaining": "90.0"})
+        self.assertEqual(limiter.window, 4)
+
+    async def test_update_cost(self):
+        await self.limiter.update({"X-Request-Cost": "10"})
+        self.assertEqual(self.limiter.cost, 10.0)
+        await self.limiter.update({"X-Request-Cost": "20"})
+        self.assertAlmostEqual(self.limiter.cost, 12.0)
+
+    async def test_update_no_headers(self):
+        await self.limiter.update({})
+        self.assertIsNone(self.limiter.remaining)
+        self.assertIsNone(self.limiter.cost)
+        self.assertEqual(self.limiter.window, 4)
+
+    # throttled()
+    def test_throttled(self):
+        self.limiter.throttled()
+        self.assertEqual(self.limiter.window, 2)
+
+    # acquire() / release()
+    async def test_acquire_blocks_when_window_full(self):
+        limiter = RateLimiter(initial_window=2, max_window=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        self.assertEqual(limiter.in_flight, 2)
+
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        await limiter.release()
+        await waiter
+        self.assertEqual(limiter.in_flight, 2)
+
+    async def test_context_manager(self):
+        async with self.limiter:
+            self.assertEqual(self.limiter.in_flight, 1)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+
+class TestParseRateLimitHeaders(unittest.TestCase):
+    def test_parse(self):
+        headers = {"X-Rate-Limit-Remaining": "699.5", "X-Request-Cost": "0.5"}
+        self.assertEqual(parse_rate_limit_headers(headers), (699.5, 0.5))
+
+    def test_parse_missing_or_malformed(self):
+        headers = {"X-Rate-Limit-Remaining": "lots"}
+        self.assertEqual(parse_rate_limit_headers(headers), (None, None))
@@ -1,15 +1,22 @@
+import asyncio
 from datetime import datetime
 import unittest
+from unittest import mock
 from urllib.parse import quote
 import re
 
+import aiohttp
 from aioresponses import aioresponses, CallbackResult
 
 from canvasaio import Canvas
+from canvasaio.cache import CachedResponse, MemoryCache
+from canvasaio.rate_limit import RateLimiter
+from canvasaio.retry import RetryPolicy
 from canvasaio.exceptions import (
     BadRequest,
     CanvasException,
     Conflict,
+    Forbidden,
     InvalidAccessToken,
     ResourceDoesNotExist,
     Unauthorized,
@@ -28,6 +35,48 @@ class TestRequester(unittest.IsolatedAsyncioTestCase):
     async def asyncTearDown(self):
         await self.canvas.close()
 
+    # _session
+    async def test_session_pool_settings(self, m):
+        requester = Canvas(
+            settings.BASE_URL,
+            settings.API_KEY,
+            limit=10,
+            limit_per_host=5,
+            connect_timeout=3,
+            read_timeout=30,
+        )._Canvas__requester
+
+        session = await requester._session
+        self.assertEqual(session.connector.limit, 10)
+        self.assertEqual(session.connector.limit_per_host, 5)
+        self.assertEqual(session.timeout.sock_connect, 3)
+        self.assertEqual(session.timeout.sock_read, 30)
+
+        await requester.close()
+        self.assertTrue(session.connector is None or session.connector.closed)
+
+    async def test_session_default_timeout(self, m):
+        # The defaults match those of aiohttp
+        session = await self.requester._session
+        self.assertEqual(session.timeout.total, 5 * 60)
+        self.assertEqual(session.timeout.sock_connect, 30)
+        self.assertIsNone(session.timeout.sock_read)
+
+    async def test_session_shared_connector(self, m):
+        connector = aiohttp.TCPConnector(limit=7)
+        canvases = [
+            Canvas(settings.BASE_URL, settings.API_KEY, connector=connector)
+            for _ in range(2)
+        ]
+
+        for canvas in canvases:
+            session = await canvas._Canvas__requester._session
+            self.assertIs(session.connector, connector)
+            await canvas.close()
+
+        self.assertFalse(connector.closed)
+        await connector.close()
+
     # request()
     async def test_request_get(self, m):
         register_uris({"requests": ["get"]}, m)
@@ -97,22 +146,301 @@ class TestRequester(unittest.IsolatedAsyncioTestCase):
         response = await self.requester.request("PUT", "fake_put_request")
         self.assertEqual(response.status, 200)
 
-    async def test_request_cache(self, m):
-        register_uris({"requests": ["get"]}, m)
+    async def test_request_journal(self, m):
+        m.get(
+            settings.BASE_URL_WITH_VERSION + "fake_get_request",
+            headers={"X-Rate-Limit-Remaining": "600.5", "X-Request-Cost": "0.25"},
+        )
 
         response = await self.requester.request("GET", "fake_get_request")
-        self.assertEqual(response, self.requester._cache[0])
-
-    async def test_request_cache_clear_after_5(self, m):
+        record = self.requester.journal[0]
+        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.url, settings.BASE_URL_WITH_VERSION + "fake_get_request")
+        self.assertEqual(record.status, response.status)
+        self.assertEqual(record.rate_limit_remaining, 600.5)
+        self.assertEqual(record.request_cost, 0.25)
+        self.assertNotIsInstance(record, aiohttp.ClientResponse)
+
+    async def test_request_journal_clear_after_5(self, m):
         register_uris({"requests": ["get", "post"]}, m)
 
         for i in range(5):
             await self.requester.request("GET", "fake_get_request")
 
-        response = await self.requester.request("POST", "fake_post_request")
+        await self.requester.request("POST", "fake_post_request")
+
+        self.assertLessEqual(len(self.requester.journal), 5)
+        self.assertEqual(self.requester.journal[0].method, "POST")
+
+    async def test_request_journal_size(self, m):
+        requester = Canvas(
+            settings.BASE_URL, settings.API_KEY, journal_size=2
+        )._Canvas__requester
+        register_uris({"requests": ["get"]}, m)
+
+        for i in range(3):
+            await requester.request("GET", "fake_get_request")
+        await requester.close()
+
+        self.assertEqual(len(requester.journal), 2)
+
+    async def test_request_rate_limiter(self, m):
+        limiter = RateLimiter(initial_window=2, low_watermark=100, high_watermark=300)
+        requester = Canvas(
+            settings.BASE_URL, settings.API_KEY, rate_limiter=limiter
+        )._Canvas__requester
+        m.get(
+            settings.BASE_URL_WITH_VERSION + "fake_get_request",
+            headers={"X-Rate-Limit-Remaining": "650.0", "X-Request-Cost": "1.5"},
+        )
+
+        response = await requester.request("GET", "fake_get_request")
+        await requester.close()
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(limiter.window, 3)
+        self.assertEqual(limiter.remaining, 650.0)
+        self.assertEqual(limiter.cost, 1.5)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_request_rate_limiter_throttled(self, m):
+        limiter = RateLimiter(initial_window=4)
+        requester = Canvas(
+            settings.BASE_URL, settings.API_KEY, rate_limiter=limiter
+        )._Canvas__requester
+        m.get(
+            settings.BASE_URL_WITH_VERSION + "throttled",
+            status=403,
+            body="403 Forbidden (Rate Limit Exceeded)",
+        )
+
+        with self.assertRaises(Forbidden):
+            await requester.request("GET", "throttled")
+        await requester.close()
+
+        self.assertEqual(limiter.window, 2)
+
+    async def test_request_retry(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "flaky"
+        m.get(url, status=503)
+        m.get(url, status=429, headers={"Retry-After": "0"})
+        m.get(url, status=200, payload={"id": 1})
+
+        response = await self.requester.request("GET", "flaky")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(policy.retries, 2)
+        self.assertEqual(policy.retries_by_reason[503], 1)
+        self.assertEqual(policy.retries_by_reason[429], 1)
+
+    async def test_request_retry_rate_limited(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "throttled"
+        m.get(url, status=403, body="403 Forbidden (Rate Limit Exceeded)")
+        m.get(url, status=200)
+
+        response = await self.requester.request("GET", "throttled")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(policy.retries_by_reason[403], 1)
+
+    async def test_request_retry_connect_error(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "unreachable"
+        key = mock.Mock(host="example.com", port=443, ssl=True)
+        refused = aiohttp.ClientConnectorError(key, ConnectionRefusedError(111, "no"))
+        m.get(url, exception=refused)
+        m.get(url, status=200)
+
+        response = await self.requester.request("GET", "unreachable")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(policy.retries_by_reason["ClientConnectorError"], 1)
+
+    async def test_request_retry_ssl_error_not_retried(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "untrusted"
+        key = mock.Mock(host="example.com", port=443, ssl=True)
+        m.get(url, exception=aiohttp.ClientSSLError(key, OSError(1, "bad cert")))
+        m.get(url, status=200)
+
+        with self.assertRaises(aiohttp.ClientSSLError):
+            await self.requester.request("GET", "untrusted")
+        self.assertEqual(policy.retries, 0)
+
+    async def test_request_retry_forbidden_not_retried(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        m.get(settings.BASE_URL_WITH_VERSION + "forbidden", status=403, body="nope")
+
+        with self.assertRaises(Forbidden):
+            await self.requester.request("GET", "forbidden")
+        self.assertEqual(policy.retries, 0)
+
+    async def test_request_retry_exhausted(self, m):
+        policy = RetryPolicy(backoff_factor=0, max_retries=5)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "down"
+        m.get(url, status=502, repeat=True)
+
+        with self.assertRaises(CanvasException):
+            await self.requester.request("GET", "down", _max_retries=2)
+        self.assertEqual(policy.retries, 2)
+        self.assertEqual(policy.exhausted, 1)
+
+    async def test_request_retry_unsafe_method(self, m):
+        policy = RetryPolicy(backoff_factor=0)
+        self.requester.retry_policy = policy
+        url = settings.BASE_URL_WITH_VERSION + "down"
+        m.put(url, status=503)
+        m.put(url, status=503)
+        m.put(url, status=200)
+
+        with self.assertRaises(CanvasException):
+            await self.requester.request("PUT", "down")
+        self.assertEqual(policy.retries, 0)
+
+        response = await self.requester.request("PUT", "down", _idempotent=True)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(policy.retries, 1)
+
+    async def test_request_log_structured(self, m):
+        m.get(settings.BASE_URL_WITH_VERSION + "logged", payload={"id": 1})
+
+        with self.assertLogs("canvasaio.requester", level="INFO") as logs:
+            await self.requester.request("GET", "logged")
+
+        records = [r for r in logs.records if hasattr(r, "canvas_request")]
+        self.assertEqual(len(records), 1)
+        record = records[0].canvas_request
+        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.url, settings.BASE_URL_WITH_VERSION + "logged")
+        self.assertEqual(record.status, 200)
+        self.assertGreaterEqual(record.elapsed, 0)
+
+    async def test_request_log_body_not_decoded(self, m):
+        m.get(settings.BASE_URL_WITH_VERSION + "logged", payload={"id": 1})
+
+        with mock.patch.object(aiohttp.ClientResponse, "json") as json_mock:
+            with self.assertLogs("canvasaio.requester", level="INFO"):
+                await self.requester.request("GET", "logged")
+        json_mock.assert_not_called()
+
+    async def test_request_log_body_debug(self, m):
+        m.get(settings.BASE_URL_WITH_VERSION + "logged", body="not json")
+
+        with self.assertLogs("canvasaio.requester", level="DEBUG") as logs:
+            await self.requester.request("GET", "logged")
+        self.assertIn("DEBUG:canvasaio.requester:Data: 'not json'", logs.output)
+
+    async def test_request_conditional_cache(self, m):
+        self.requester.cache = MemoryCache()
+        url = settings.BASE_URL_WITH_VERSION + "courses/1"
+        m.get(url, payload={"id": 1}, headers={"ETag": '"v1"'})
+
+        async def not_modified(url, headers, **kwargs):
+            self.assertEqual(headers["If-None-Match"], '"v1"')
+            return CallbackResult(status=304)
+
+        m.get(url, callback=not_modified)
+
+        response = await self.requester.request("GET", "courses/1")
+        self.assertEqual(await response.json(), {"id": 1})
+        self.assertEqual(len(self.requester.cache), 1)
+
+        response = await self.requester.request("GET", "courses/1")
+        self.assertIsInstance(response, CachedResponse)
+        self.assertEqual(await response.json(), {"id": 1})
+        self.assertEqual(self.requester.journal[0].status, 304)
+
+    async def test_request_conditional_cache_no_validator(self, m):
+        self.requester.cache = MemoryCache()
+        m.get(settings.BASE_URL_WITH_VERSION + "courses/1", payload={"id": 1})
+
+        await self.requester.request("GET", "courses/1")
+        self.assertEqual(len(self.requester.cache), 0)
+
+    async def test_request_conditional_cache_invalidate(self, m):
+        self.requester.cache = MemoryCache()
+        base = settings.BASE_URL_WITH_VERSION
+        m.get(base + "courses/1", payload={"id": 1}, headers={"ETag": '"v1"'})
+        m.get(base + "courses/1/users", payload=[], headers={"ETag": '"v2"'})
+        m.get(base + "courses/2", payload={"id": 2}, headers={"ETag": '"v3"'})
+        m.put(base + "courses/1/users", payload={})
+
+        await self.requester.request("GET", "courses/1")
+        await self.requester.request("GET", "courses/1/users")
+        await self.requester.request("GET", "courses/2")
+        self.assertEqual(len(self.requester.cache), 3)
+
+        await self.requester.request("PUT", "courses/1/users")
+        self.assertEqual(len(self.requester.cache), 1)
+
+    async def test_request_conditional_cache_external_url(self, m):
+        self.requester.cache = MemoryCache()
+        base = settings.BASE_URL_WITH_VERSION
+        m.get(base + "courses/1", payload={"id": 1}, headers={"ETag": '"v1"'})
+        m.post("https://uploads.example.com/api/v1/courses/1", payload={})
+
+        await self.requester.request("GET", "courses/1")
+        await self.requester.request(
+            "POST", _url="https://uploads.example.com/api/v1/courses/1"
+        )
+        self.assertEqual(len(self.requester.cache), 1)
+
+    async def test_request_conditional_cache_no_store(self, m):
+        self.requester.cache = MemoryCache()
+        m.get(
+            settings.BASE_URL_WITH_VERSION + "courses/1",
+            payload={"id": 1},
+            headers={"ETag": '"v1"', "Cache-Control": "private, no-store"},
+        )
+
+        await self.requester.request("GET", "courses/1")
+        self.assertEqual(len(self.requester.cache), 0)
+
+    async def test_request_coalesce(self, m):
+        self.requester.coalesce = True
+        m.get(settings.BASE_URL_WITH_VERSION + "courses/1?a=1&b=2", payload={"id": 1})
+
+        responses = await asyncio.gather(
+            self.requester.request("GET", "courses/1", a=1, b=2),
+            self.requester.request("GET", "courses/1", b=2, a=1),
+            self.requester.request("GET", "courses/1", _kwargs=[("a", 1), ("b", 2)]),
+        )
+
+        self.assertIs(responses[0], responses[1])
+        self.assertIs(responses[0], responses[2])
+        for response in responses:
+            self.assertEqual(await response.json(), {"id": 1})
+        self.assertEqual(len(self.requester.journal), 1)
+        self.assertEqual(self.requester._in_flight, {})
+
+    async def test_request_coalesce_error(self, m):
+        self.requester.coalesce = True
+        m.get(settings.BASE_URL_WITH_VERSION + "404", status=404)
+
+        results = await asyncio.gather(
+            self.requester.request("GET", "404"),
+            self.requester.request("GET", "404"),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            self.assertIsInstance(result, ResourceDoesNotExist)
+
+    async def test_request_coalesce_sequential(self, m):
+        self.requester.coalesce = True
+        register_uris({"requests": ["get"]}, m)
 
-        self.assertLessEqual(len(self.requester._cache), 5)
-        self.assertEqual(response, self.requester._cache[0])
+        await self.requester.request("GET", "fake_get_request")
+        await self.requester.request("GET", "fake_get_request")
+        self.assertEqual(len(self.requester.journal), 2)
 
     async def test_request_lowercase_boolean(self, m):
         async def callback(url, data, **kwargs):
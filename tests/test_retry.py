@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import unittest
+
+from canvasaio.retry import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(backoff_factor=1, max_backoff=10)
+
+    # __init__()
+    def test_init_negative_retries(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+
+    # allows_method()
+    def test_allows_method_get(self):
+        self.assertTrue(self.policy.allows_method("GET"))
+
+    def test_allows_method_post(self):
+        self.assertFalse(self.policy.allows_method("POST"))
+        self.assertFalse(self.policy.allows_method("POST", idempotent=True))
+
+    def test_allows_method_idempotent(self):
+        self.assertFalse(self.policy.allows_method("PUT"))
+        self.assertTrue(self.policy.allows_method("PUT", idempotent=True))
+        self.assertTrue(self.policy.allows_method("DELETE", idempotent=True))
+
+    # allows_status()
+    def test_allows_status(self):
+        for status in (429, 502, 503, 504):
+            self.assertTrue(self.policy.allows_status(status))
+        for status in (400, 404, 500):
+            self.assertFalse(self.policy.allows_status(status))
+
+    def test_allows_status_forbidden(self):
+        self.assertFalse(self.policy.allows_status(403))
+        self.assertTrue(self.policy.allows_status(403, rate_limited=True))
+
+        policy = RetryPolicy(retry_rate_limited=False)
+        self.assertFalse(policy.allows_status(403, rate_limited=True))
+
+    # backoff()
+    def test_backoff_bounds(self):
+        for attempt in range(10):
+            delay = self.policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(10, 2**attempt))
+
+    def test_backoff_retry_after(self):
+        policy = RetryPolicy(max_retry_after=60)
+        self.assertGreaterEqual(policy.backoff(0, "30"), 30)
+
+    def test_backoff_retry_after_clamped(self):
+        self.assertLessEqual(self.policy.backoff(0, "3600"), 10)
+
+        policy = RetryPolicy(max_backoff=10, max_retry_after=120)
+        self.assertEqual(policy.backoff(0, "3600"), 120)
+
+    # record()
+    def test_record(self):
+        self.policy.record(503)
+        self.policy.record(503)
+        self.policy.record("ServerDisconnectedError")
+
+        self.assertEqual(self.policy.retries, 3)
+        self.assertEqual(self.policy.retries_by_reason[503], 2)
+        self.assertEqual(self.policy.retries_by_reason["ServerDisconnectedError"], 1)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_parse_seconds(self):
+        self.assertEqual(parse_retry_after("12"), 12.0)
+
+    def test_parse_http_date(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=120)
+        delay = parse_retry_after(format_datetime(when, usegmt=True))
+        self.assertGreater(delay, 100)
+        self.assertLessEqual(delay, 120)
+
+    def test_parse_past_date(self):
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_parse_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
@@ -147,6 +147,23 @@ class TestGroupedSubmission(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(grouped_submission.submissions, list)
         self.assertEqual(len(grouped_submission.submissions), 0)
 
+    def test__init__lazy(self):
+        requester = self.canvas._Canvas__requester
+        requester.lazy_objects = True
+        grouped_submission = GroupedSubmission(
+            requester, {"user_id": 1, "submissions": [{"id": 1}, {"id": 2}]}
+        )
+
+        self.assertNotIn("submissions", grouped_submission.__dict__)
+        submissions = grouped_submission.submissions
+        self.assertEqual(len(submissions), 2)
+        self.assertIsInstance(submissions[0], Submission)
+        self.assertEqual(submissions[1].id, 2)
+        self.assertIs(grouped_submission.submissions, submissions)
+
+        empty = GroupedSubmission(requester, {"user_id": 1})
+        self.assertEqual(empty.submissions, [])
+
     # __str__()
     def test__str__(self):
         string = str(self.grouped_submission)
@@ -1,7 +1,8 @@
+import re
 import unittest
 import uuid
 
-from aioresponses import aioresponses
+from aioresponses import aioresponses, CallbackResult
 
 from canvasaio.canvas import Canvas
 from canvasaio.upload import Uploader
@@ -79,3 +80,116 @@ class TestUploader(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(result[0])
         self.assertIsInstance(result[1], dict)
         self.assertNotIn("url", result[1])
+
+    # streamed uploads
+    def capture_upload(self, m, status=200):
+        """
+        Mock the upload URL, serializing the multipart body that is posted.
+        """
+        sent = {}
+
+        class Body(object):
+            def __init__(self):
+                self.data = bytearray()
+                self.writes = 0
+
+            async def write(self, chunk):
+                self.data.extend(chunk)
+                self.writes += 1
+
+        async def callback(url, data=None, **kwargs):
+            body = Body()
+            await data.write(body)
+            sent["body"] = bytes(body.data)
+            sent["size"] = data.size
+            return CallbackResult(status=status, payload={"url": "great_url_success"})
+
+        m.post(re.compile(r".*/upload_response_upload_url$"), callback=callback)
+        return sent
+
+    async def test_start_streams_binary_file(self, m):
+        register_uris({"uploader": ["upload_response"]}, m)
+        sent = self.capture_upload(m)
+        content = bytes(range(256)) * 1000
+        with open(self.filename, "wb") as file:
+            file.write(content)
+        progress = []
+
+        uploader = Uploader(
+            self.requester,
+            "upload_response",
+            self.filename,
+            buffer_size=10000,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        result = await uploader.start()
+
+        self.assertTrue(result[0])
+        self.assertIn(content, sent["body"])
+        self.assertIn(b"some_param", sent["body"])
+        # The size is known, so the body is not sent with chunked encoding
+        self.assertEqual(sent["size"], len(sent["body"]))
+        self.assertEqual(len(progress), 26)
+        self.assertEqual(progress[0], (10000, len(content)))
+        self.assertEqual(progress[-1], (len(content), len(content)))
+
+    async def test_start_streams_text_file(self, m):
+        register_uris({"uploader": ["upload_response"]}, m)
+        sent = self.capture_upload(m)
+        self.file.write("héllo\n" * 1000)
+        self.file.seek(6)
+
+        uploader = Uploader(self.requester, "upload_response", self.file)
+        result = await uploader.start()
+
+        self.assertTrue(result[0])
+        self.assertIn("\n" + "héllo\n" * 999, sent["body"].decode("utf-8"))
+        # Sent as the bytes on disk, with a known size
+        self.assertEqual(sent["size"], len(sent["body"]))
+
+    async def test_start_async_iterable(self, m):
+        register_uris({"uploader": ["upload_response"]}, m)
+        sent = self.capture_upload(m)
+        progress = []
+
+        async def chunks():
+            for _ in range(3):
+                yield b"a" * 100
+
+        async def on_progress(done, total):
+            progress.append(done)
+
+        uploader = Uploader(
+            self.requester,
+            "upload_response",
+            chunks(),
+            progress=on_progress,
+            name="stream.bin",
+            size=300,
+        )
+        result = await uploader.start()
+
+        self.assertTrue(result[0])
+        self.assertIn(b"a" * 300, sent["body"])
+        self.assertIn(b'filename="stream.bin"', sent["body"])
+        self.assertEqual(progress, [100, 200, 300])
+
+    async def test_start_async_iterable_wrong_size(self, m):
+        register_uris({"uploader": ["upload_response"]}, m)
+        self.capture_upload(m)
+
+        async def chunks():
+            yield b"a" * 100
+
+        uploader = Uploader(
+            self.requester, "upload_response", chunks(), name="stream.bin", size=300
+        )
+        with self.assertRaises(ValueError):
+            await uploader.start()
+
+    def test_init_async_iterable_without_name(self, m):
+        async def chunks():
+            yield b""
+
+        with self.assertRaises(ValueError):
+            Uploader(self.requester, "upload_response", chunks())